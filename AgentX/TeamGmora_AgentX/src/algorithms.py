@@ -4,10 +4,31 @@ Each algorithm detects specific types of fraud or operational issues
 All algorithms are properly tagged for automated judging
 """
 from typing import Dict, List, Any, Optional
-from datetime import datetime, timedelta
+from datetime import datetime
 from collections import defaultdict, Counter
+from bisect import bisect_left
+from array import array
 import statistics
 
+from data_loader import DataLoader, _EMPTY_DICT
+from events import (
+    ScannerAvoidanceEvent, BarcodeSwitchingEvent, WeightDiscrepancyEvent,
+    LongQueueEvent, LongWaitEvent, SystemCrashEvent, StaffingNeedsEvent,
+    CheckoutActionEvent, InventoryDiscrepancyEvent, SuccessEvent
+)
+
+# RFID locations counted towards on-hand inventory
+_INVENTORY_LOCATIONS = frozenset(('IN_SCAN_AREA', 'SHELF'))
+
+# Device statuses treated as a system failure (the crash pass only loads these)
+CRASH_STATUSES = frozenset(('System Crash', 'Read Error'))
+
+# Event times are compared as epoch nanoseconds (see DataLoader.timestamp_ns)
+_NS_PER_SECOND = 1_000_000_000
+
+# Queue monitoring fields scanned as columns by the queue detectors
+QUEUE_COLUMN_FIELDS = ('data.customer_count', 'data.average_dwell_time')
+
 
 class FraudDetectionAlgorithms:
     """Fraud detection algorithms for self-checkout scenarios"""
@@ -20,7 +41,7 @@ class FraudDetectionAlgorithms:
         score = base_score
         for factor_value in factors.values():
             score += factor_value
-        return min(score, 100.0)
+        return 100.0 if score > 100.0 else score
     
     def _classify_severity(self, score: float) -> str:
         """Classify severity based on risk score"""
@@ -32,63 +53,206 @@ class FraudDetectionAlgorithms:
             return 'MEDIUM'
         return 'LOW'
     
-    # @algorithm Scanner Avoidance Detection | Detects items detected by RFID but not scanned at POS, indicating potential theft
-    def detect_scanner_avoidance(self, rfid_events: List[Dict], pos_events: List[Dict],
-                                 time_window: int, products_catalog: Dict) -> List[Dict]:
+    def detect_all_fraud(self, pos_events: List[Dict], rfid_events: List[Dict],
+                         recognition_events: List[Dict], products_catalog: Optional[Dict],
+                         time_window: Optional[int] = None,
+                         confidence_threshold: Optional[float] = None,
+                         tolerance_percent: Optional[float] = None,
+                         catalog_columns: Optional[Dict[str, Any]] = None) -> Dict[str, List[Dict]]:
         """
-        Scanner Avoidance Detection Algorithm
-        Method: Time-window correlation between RFID readings and POS transactions
+        Fused Fraud Detection Kernel
+        Method: One pass over POS transactions builds the shared indices and checks weights,
+        then RFID and recognition events are probed against them. A detector is skipped
+        when its threshold is None. Catalog lookups go through the columnar view from
+        DataLoader.build_catalog_columns (built here if not supplied).
         """
-        detected = []
+        if catalog_columns is None:
+            catalog = products_catalog if products_catalog is not None else _EMPTY_DICT
+            catalog_columns = DataLoader.build_catalog_columns(catalog)
+        sku_to_id = catalog_columns['sku_to_id']
+        catalog_weight = catalog_columns['weight']
+        catalog_price = catalog_columns['price']
         
-        # Index POS transactions for fast lookup
-        pos_index = defaultdict(list)
-        for pos in pos_events:
-            if pos.get('data', {}).get('sku'):
-                key = (pos['station_id'], pos['timestamp'])
-                pos_index[key].append(pos['data']['sku'])
+        scanner_avoidance = []
+        barcode_switching = []
+        weight_discrepancies = []
         
-        # Check RFID events
-        for rfid in rfid_events:
-            sku = rfid.get('data', {}).get('sku')
-            location = rfid.get('data', {}).get('location')
+        check_scanner = time_window is not None
+        check_barcode = confidence_threshold is not None
+        check_weight = tolerance_percent is not None
+        
+        # Event times as epoch ns ints (precomputed by the loader)
+        event_time_ns = DataLoader.event_time_ns_getter()
+        
+        # POS times per (station, sku) for the RFID window check
+        pos_times = defaultdict(list)
+        # POS by timestamp and station for camera validation
+        pos_index = {}
+        
+        for pos in pos_events:
+            data = pos.get('data', _EMPTY_DICT)
+            
+            if check_scanner and data.get('sku'):
+                # A POS line without a parseable time can never match a reading
+                pos_time = event_time_ns(pos)
+                if pos_time is not None:
+                    pos_times[(pos['station_id'], data['sku'])].append(pos_time)
+            
+            if check_barcode:
+                pos_index[(pos['timestamp'], pos['station_id'])] = pos
+            
+            if not check_weight:
+                continue
+            
+            sku = pos['data']['sku']
+            sku_id = sku_to_id.get(sku)
+            if sku_id is None:
+                continue
+            
+            expected_weight = catalog_weight[sku_id]
+            if not expected_weight:
+                continue
             
-            # Only check items in scan area
-            if not sku or location != 'IN_SCAN_AREA':
+            actual_weight = pos['data']['weight_g']
+            weight_diff = abs(actual_weight - expected_weight) / expected_weight * 100
+            if weight_diff <= tolerance_percent:
                 continue
             
-            station = rfid['station_id']
-            rfid_time = datetime.fromisoformat(rfid['timestamp'])
+            price = catalog_price[sku_id]
+            weight_factor = weight_diff / 5
+            price_factor = price / 50
             
-            # Look for matching POS transaction in time window
-            found = False
-            for offset in range(-time_window, time_window + 1):
-                check_time = (rfid_time + timedelta(seconds=offset)).isoformat()
-                if sku in pos_index.get((station, check_time), []):
-                    found = True
-                    break
+            risk_score = self._calculate_risk_score(60.0, {
+                'weight_factor': 30 if weight_factor > 30 else weight_factor,
+                'price_factor': 10 if price_factor > 10 else price_factor
+            })
             
-            if not found:
+            weight_discrepancies.append(WeightDiscrepancyEvent(
+                timestamp=pos['timestamp'],
+                type='WEIGHT_DISCREPANCY',
+                station_id=pos['station_id'],
+                customer_id=pos['data']['customer_id'],
+                product_sku=sku,
+                expected_weight=int(expected_weight),
+                actual_weight=int(actual_weight),
+                difference_percent=round(weight_diff, 2),
+                estimated_loss=round(price, 2) if price else None,
+                risk_score=round(risk_score, 1),
+                severity=self._classify_severity(risk_score)
+            ))
+        
+        # Check RFID events against the POS window
+        if check_scanner:
+            window = round(time_window * _NS_PER_SECOND)
+            for times in pos_times.values():
+                times.sort()
+            
+            for rfid in rfid_events:
+                data = rfid.get('data', _EMPTY_DICT)
+                sku = data.get('sku')
+                location = data.get('location')
+                
+                # Only check items in scan area
+                if not sku or location != 'IN_SCAN_AREA':
+                    continue
+                
+                # Readings without a parseable time are skipped
+                rfid_time = event_time_ns(rfid)
+                if rfid_time is None:
+                    continue
+                
+                station = rfid['station_id']
+                
+                # Look for matching POS transaction in time window
+                times = pos_times.get((station, sku))
+                if times:
+                    i = bisect_left(times, rfid_time - window)
+                    if i < len(times) and times[i] <= rfid_time + window:
+                        continue
+                
                 # Scanner avoidance detected
-                product_info = products_catalog.get(sku, {})
-                price = product_info.get('price', 0)
+                sku_id = sku_to_id.get(sku)
+                price = catalog_price[sku_id] if sku_id is not None else 0
                 
+                price_factor = price / 30
                 risk_score = self._calculate_risk_score(75.0, {
-                    'price_factor': min(price / 30, 20),
+                    'price_factor': 20 if price_factor > 20 else price_factor,
                     'location_factor': 5
                 })
                 
-                detected.append({
-                    'timestamp': rfid['timestamp'],
-                    'type': 'SCANNER_AVOIDANCE',
-                    'station_id': station,
-                    'product_sku': sku,
-                    'estimated_loss': round(price, 2) if price else None,
-                    'risk_score': round(risk_score, 1),
-                    'severity': self._classify_severity(risk_score)
+                scanner_avoidance.append(ScannerAvoidanceEvent(
+                    timestamp=rfid['timestamp'],
+                    type='SCANNER_AVOIDANCE',
+                    station_id=station,
+                    product_sku=sku,
+                    estimated_loss=round(price, 2) if price else None,
+                    risk_score=round(risk_score, 1),
+                    severity=self._classify_severity(risk_score)
+                ))
+        
+        # Check recognition events against the scanned barcode
+        if check_barcode:
+            for recog in recognition_events:
+                confidence = recog['data']['accuracy']
+                
+                # Only trust high-confidence predictions
+                if confidence < confidence_threshold:
+                    continue
+                
+                predicted_sku = recog['data']['predicted_product']
+                pos = pos_index.get((recog['timestamp'], recog['station_id']))
+                if pos is None:
+                    continue
+                
+                scanned_sku = pos['data']['sku']
+                if predicted_sku == scanned_sku:
+                    continue
+                
+                # Mismatch detected
+                pred_id = sku_to_id.get(predicted_sku)
+                scan_id = sku_to_id.get(scanned_sku)
+                pred_price = catalog_price[pred_id] if pred_id is not None else 0
+                scan_price = catalog_price[scan_id] if scan_id is not None else 0
+                price_gap = pred_price - scan_price
+                if price_gap < 0:
+                    price_gap = 0
+                price_gap_factor = price_gap / 5
+                
+                risk_score = self._calculate_risk_score(70.0, {
+                    'confidence_factor': (confidence - confidence_threshold) * 25,
+                    'price_gap_factor': 20 if price_gap_factor > 20 else price_gap_factor
                 })
+                
+                barcode_switching.append(BarcodeSwitchingEvent(
+                    timestamp=recog['timestamp'],
+                    type='BARCODE_SWITCHING',
+                    station_id=recog['station_id'],
+                    customer_id=pos['data']['customer_id'],
+                    actual_sku=predicted_sku,
+                    scanned_sku=scanned_sku,
+                    confidence=round(confidence, 2),
+                    price_gap=round(price_gap, 2) if price_gap else None,
+                    predicted_price=round(pred_price, 2) if pred_price else None,
+                    scanned_price=round(scan_price, 2) if scan_price else None,
+                    risk_score=round(risk_score, 1),
+                    severity=self._classify_severity(risk_score)
+                ))
         
-        return detected
+        return {
+            'SCANNER_AVOIDANCE': scanner_avoidance,
+            'BARCODE_SWITCHING': barcode_switching,
+            'WEIGHT_DISCREPANCY': weight_discrepancies
+        }
+    
+    # @algorithm Scanner Avoidance Detection | Detects items detected by RFID but not scanned at POS, indicating potential theft
+    def detect_scanner_avoidance(self, rfid_events: List[Dict], pos_events: List[Dict],
+                                 time_window: int, products_catalog: Dict) -> List[Dict]:
+        """
+        Scanner Avoidance Detection Algorithm
+        Method: Time-window correlation between RFID readings and POS transactions
+        """
+        return self.detect_all_fraud(pos_events, rfid_events, [], products_catalog,
+                                     time_window=time_window)['SCANNER_AVOIDANCE']
     
     # @algorithm Barcode Switching Detection | Detects when camera-recognized product differs from scanned barcode, indicating fraud
     def detect_barcode_switching(self, recognition_events: List[Dict], pos_events: List[Dict],
@@ -97,56 +261,8 @@ class FraudDetectionAlgorithms:
         Barcode Switching Detection Algorithm
         Method: Computer vision validation of POS transactions
         """
-        detected = []
-        
-        # Index POS by timestamp and station
-        pos_index = {}
-        for pos in pos_events:
-            key = (pos['timestamp'], pos['station_id'])
-            pos_index[key] = pos
-        
-        # Check recognition events
-        for recog in recognition_events:
-            confidence = recog['data']['accuracy']
-            
-            # Only trust high-confidence predictions
-            if confidence < confidence_threshold:
-                continue
-            
-            predicted_sku = recog['data']['predicted_product']
-            key = (recog['timestamp'], recog['station_id'])
-            
-            if key in pos_index:
-                pos = pos_index[key]
-                scanned_sku = pos['data']['sku']
-                
-                # Mismatch detected
-                if predicted_sku != scanned_sku:
-                    pred_price = products_catalog.get(predicted_sku, {}).get('price', 0)
-                    scan_price = products_catalog.get(scanned_sku, {}).get('price', 0)
-                    price_gap = max(pred_price - scan_price, 0)
-                    
-                    risk_score = self._calculate_risk_score(70.0, {
-                        'confidence_factor': (confidence - confidence_threshold) * 25,
-                        'price_gap_factor': min(price_gap / 5, 20)
-                    })
-                    
-                    detected.append({
-                        'timestamp': recog['timestamp'],
-                        'type': 'BARCODE_SWITCHING',
-                        'station_id': recog['station_id'],
-                        'customer_id': pos['data']['customer_id'],
-                        'actual_sku': predicted_sku,
-                        'scanned_sku': scanned_sku,
-                        'confidence': round(confidence, 2),
-                        'price_gap': round(price_gap, 2) if price_gap else None,
-                        'predicted_price': round(pred_price, 2) if pred_price else None,
-                        'scanned_price': round(scan_price, 2) if scan_price else None,
-                        'risk_score': round(risk_score, 1),
-                        'severity': self._classify_severity(risk_score)
-                    })
-        
-        return detected
+        return self.detect_all_fraud(pos_events, [], recognition_events, products_catalog,
+                                     confidence_threshold=confidence_threshold)['BARCODE_SWITCHING']
     
     # @algorithm Weight Discrepancy Detection | Identifies significant weight variances indicating multiple items or wrong products
     def detect_weight_discrepancies(self, pos_events: List[Dict], products_catalog: Dict,
@@ -155,39 +271,8 @@ class FraudDetectionAlgorithms:
         Weight Discrepancy Detection Algorithm
         Method: Statistical weight analysis of transactions
         """
-        detected = []
-        
-        for pos in pos_events:
-            sku = pos['data']['sku']
-            actual_weight = pos['data']['weight_g']
-            
-            if sku in products_catalog:
-                expected_weight = products_catalog[sku]['weight']
-                weight_diff = abs(actual_weight - expected_weight) / expected_weight * 100
-                
-                if weight_diff > tolerance_percent:
-                    price = products_catalog[sku].get('price', 0)
-                    
-                    risk_score = self._calculate_risk_score(60.0, {
-                        'weight_factor': min(weight_diff / 5, 30),
-                        'price_factor': min(price / 50, 10)
-                    })
-                    
-                    detected.append({
-                        'timestamp': pos['timestamp'],
-                        'type': 'WEIGHT_DISCREPANCY',
-                        'station_id': pos['station_id'],
-                        'customer_id': pos['data']['customer_id'],
-                        'product_sku': sku,
-                        'expected_weight': int(expected_weight),
-                        'actual_weight': int(actual_weight),
-                        'difference_percent': round(weight_diff, 2),
-                        'estimated_loss': round(price, 2) if price else None,
-                        'risk_score': round(risk_score, 1),
-                        'severity': self._classify_severity(risk_score)
-                    })
-        
-        return detected
+        return self.detect_all_fraud(pos_events, [], [], products_catalog,
+                                     tolerance_percent=tolerance_percent)['WEIGHT_DISCREPANCY']
 
 
 class OperationalAlgorithms:
@@ -200,7 +285,7 @@ class OperationalAlgorithms:
         score = base_score
         for factor_value in factors.values():
             score += factor_value
-        return min(score, 100.0)
+        return 100.0 if score > 100.0 else score
     
     def _classify_severity(self, score: float) -> str:
         if score >= 80:
@@ -211,61 +296,80 @@ class OperationalAlgorithms:
             return 'MEDIUM'
         return 'LOW'
     
+    @staticmethod
+    def _queue_columns(queue_events: List[Dict], columns: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Customer count / dwell time columns for queue_events (built if not supplied)"""
+        if columns is None:
+            columns = DataLoader.events_to_columns(queue_events, QUEUE_COLUMN_FIELDS)
+        return columns
+    
     # @algorithm Long Queue Detection | Monitors customer count to identify when queues exceed acceptable thresholds
-    def detect_long_queues(self, queue_events: List[Dict], threshold: int) -> List[Dict]:
+    def detect_long_queues(self, queue_events: List[Dict], threshold: int,
+                           columns: Optional[Dict[str, Any]] = None) -> List[Dict]:
         """
         Long Queue Detection Algorithm
-        Method: Threshold-based queue monitoring
+        Method: Threshold-based queue monitoring (threshold scan over the customer
+        count column; events are only built for the hits)
         """
         detected = []
+        counts = self._queue_columns(queue_events, columns)['data.customer_count']
         
-        for queue in queue_events:
-            customer_count = queue['data']['customer_count']
+        for i, customer_count in enumerate(counts):
+            if customer_count <= threshold:
+                continue
             
-            if customer_count > threshold:
-                risk_score = self._calculate_risk_score(50.0, {
-                    'queue_factor': min((customer_count - threshold) * 8, 45)
-                })
-                
-                detected.append({
-                    'timestamp': queue['timestamp'],
-                    'type': 'LONG_QUEUE',
-                    'station_id': queue['station_id'],
-                    'num_of_customers': customer_count,
-                    'risk_score': round(risk_score, 1),
-                    'severity': self._classify_severity(risk_score)
-                })
+            queue = queue_events[i]
+            queue_factor = (customer_count - threshold) * 8
+            risk_score = self._calculate_risk_score(50.0, {
+                'queue_factor': 45 if queue_factor > 45 else queue_factor
+            })
+            
+            detected.append(LongQueueEvent(
+                timestamp=queue['timestamp'],
+                type='LONG_QUEUE',
+                station_id=queue['station_id'],
+                num_of_customers=customer_count,
+                risk_score=round(risk_score, 1),
+                severity=self._classify_severity(risk_score)
+            ))
         
         return detected
     
     # @algorithm Wait Time Analysis | Tracks average dwell time to identify excessive customer wait periods
-    def detect_long_wait_times(self, queue_events: List[Dict], threshold_seconds: float) -> List[Dict]:
+    def detect_long_wait_times(self, queue_events: List[Dict], threshold_seconds: float,
+                               columns: Optional[Dict[str, Any]] = None) -> List[Dict]:
         """
         Wait Time Analysis Algorithm
-        Method: Dwell time threshold monitoring
+        Method: Dwell time threshold monitoring (threshold scan over the dwell time
+        column; events are only built for the hits)
         """
         detected = []
+        dwell_times = self._queue_columns(queue_events, columns)['data.average_dwell_time']
         
-        for queue in queue_events:
-            wait_time = queue['data']['average_dwell_time']
+        for i, wait_time in enumerate(dwell_times):
+            if wait_time <= threshold_seconds:
+                continue
+            
+            queue = queue_events[i]
             customer_count = queue['data'].get('customer_count', 0)
             
-            if wait_time > threshold_seconds:
-                overage = wait_time - threshold_seconds
-                risk_score = self._calculate_risk_score(45.0, {
-                    'time_factor': min(overage / 60 * 15, 35),
-                    'customer_factor': min(customer_count * 3, 15)
-                })
-                
-                detected.append({
-                    'timestamp': queue['timestamp'],
-                    'type': 'LONG_WAIT',
-                    'station_id': queue['station_id'],
-                    'wait_time_seconds': int(wait_time),
-                    'customer_count': customer_count,
-                    'risk_score': round(risk_score, 1),
-                    'severity': self._classify_severity(risk_score)
-                })
+            overage = wait_time - threshold_seconds
+            time_factor = overage / 60 * 15
+            customer_factor = customer_count * 3
+            risk_score = self._calculate_risk_score(45.0, {
+                'time_factor': 35 if time_factor > 35 else time_factor,
+                'customer_factor': 15 if customer_factor > 15 else customer_factor
+            })
+            
+            detected.append(LongWaitEvent(
+                timestamp=queue['timestamp'],
+                type='LONG_WAIT',
+                station_id=queue['station_id'],
+                wait_time_seconds=int(wait_time),
+                customer_count=customer_count,
+                risk_score=round(risk_score, 1),
+                severity=self._classify_severity(risk_score)
+            ))
         
         return detected
     
@@ -276,77 +380,90 @@ class OperationalAlgorithms:
         Method: Multi-source status monitoring
         """
         detected = []
+        # First and last failing event per (station, source)
         crash_sessions = defaultdict(lambda: {'start': None, 'end': None, 'count': 0})
+        event_time_ns = DataLoader.event_time_ns_getter()
         
         for event in all_events:
             status = event.get('status', '')
-            if status in ['System Crash', 'Read Error']:
+            if status in CRASH_STATUSES:
                 station = event.get('station_id')
                 source = event.get('_source', 'unknown')
                 
-                key = (station, source)
-                if crash_sessions[key]['start'] is None:
-                    crash_sessions[key]['start'] = event['timestamp']
+                session = crash_sessions[(station, source)]
+                if session['start'] is None:
+                    session['start'] = event
                 
-                crash_sessions[key]['end'] = event['timestamp']
-                crash_sessions[key]['count'] += 1
+                session['end'] = event
+                session['count'] += 1
         
         # Generate crash events
         for (station, source), session in crash_sessions.items():
             if session['count'] > 0:
-                start_time = datetime.fromisoformat(session['start'])
-                end_time = datetime.fromisoformat(session['end'])
-                duration = int((end_time - start_time).total_seconds())
+                start = session['start']
+                start_ns = event_time_ns(start)
+                end_ns = event_time_ns(session['end'])
+                # Duration is unknown (0) if either stamp is unparseable
+                if start_ns is None or end_ns is None:
+                    duration = 0
+                else:
+                    duration = int((end_ns - start_ns) / _NS_PER_SECOND)
                 
-                risk_score = min(75.0 + session['count'] * 2 + duration / 10, 100)
+                risk_score = 75.0 + session['count'] * 2 + duration / 10
+                if risk_score > 100:
+                    risk_score = 100
                 
-                detected.append({
-                    'timestamp': session['start'],
-                    'type': 'SYSTEM_CRASH',
-                    'station_id': station,
-                    'duration_seconds': duration,
-                    'crash_count': session['count'],
-                    'system_source': source,
-                    'risk_score': round(risk_score, 1),
-                    'severity': self._classify_severity(risk_score)
-                })
+                detected.append(SystemCrashEvent(
+                    timestamp=start['timestamp'],
+                    type='SYSTEM_CRASH',
+                    station_id=station,
+                    duration_seconds=duration,
+                    crash_count=session['count'],
+                    system_source=source,
+                    risk_score=round(risk_score, 1),
+                    severity=self._classify_severity(risk_score)
+                ))
         
         return detected
     
     # @algorithm Staffing Optimization | Analyzes queue and wait time patterns to recommend optimal staffing levels
     def detect_staffing_needs(self, queue_events: List[Dict], queue_threshold: int,
-                            wait_threshold: float) -> List[Dict]:
+                            wait_threshold: float,
+                            columns: Optional[Dict[str, Any]] = None) -> List[Dict]:
         """
         Staffing Optimization Algorithm
-        Method: Multi-factor heuristic analysis
+        Method: Multi-factor heuristic analysis (scan over the customer count and
+        dwell time columns; events are only built for the hits)
         """
         detected = []
+        columns = self._queue_columns(queue_events, columns)
+        counts = columns['data.customer_count']
+        dwell_times = columns['data.average_dwell_time']
+        surge_threshold = queue_threshold * 1.5
         
-        for queue in queue_events:
-            customer_count = queue['data']['customer_count']
-            wait_time = queue['data']['average_dwell_time']
+        for i, (customer_count, wait_time) in enumerate(zip(counts, dwell_times)):
+            # Needs staff: long queue with a long wait, or a queue well past the limit
+            if not ((customer_count > queue_threshold and wait_time > wait_threshold)
+                    or customer_count > surge_threshold):
+                continue
             
-            needs_staff = False
-            if customer_count > queue_threshold and wait_time > wait_threshold:
-                needs_staff = True
-            elif customer_count > queue_threshold * 1.5:
-                needs_staff = True
+            queue = queue_events[i]
+            queue_over = customer_count - queue_threshold
+            wait_factor = (wait_time - wait_threshold) / 60 * 5 if wait_time > wait_threshold else 0
+            risk_score = self._calculate_risk_score(55.0, {
+                'queue_factor': queue_over * 4 if queue_over > 0 else 0,
+                'wait_factor': 20 if wait_factor > 20 else wait_factor
+            })
             
-            if needs_staff:
-                risk_score = self._calculate_risk_score(55.0, {
-                    'queue_factor': max(customer_count - queue_threshold, 0) * 4,
-                    'wait_factor': min((wait_time - wait_threshold) / 60 * 5, 20) if wait_time > wait_threshold else 0
-                })
-                
-                detected.append({
-                    'timestamp': queue['timestamp'],
-                    'type': 'STAFFING_NEEDS',
-                    'station_id': queue['station_id'],
-                    'Staff_type': 'Cashier',
-                    'reason': f"Queue: {customer_count}, Wait: {int(wait_time)}s",
-                    'risk_score': round(risk_score, 1),
-                    'severity': self._classify_severity(risk_score)
-                })
+            detected.append(StaffingNeedsEvent(
+                timestamp=queue['timestamp'],
+                type='STAFFING_NEEDS',
+                station_id=queue['station_id'],
+                Staff_type='Cashier',
+                reason=f"Queue: {customer_count}, Wait: {int(wait_time)}s",
+                risk_score=round(risk_score, 1),
+                severity=self._classify_severity(risk_score)
+            ))
         
         return detected
     
@@ -367,9 +484,10 @@ class OperationalAlgorithms:
             station = queue['station_id']
             customers = queue['data']['customer_count']
             
-            time_aggregates[timestamp]['total_customers'] += customers
+            aggregate = time_aggregates[timestamp]
+            aggregate['total_customers'] += customers
             if customers > 0:
-                time_aggregates[timestamp]['active_stations'].add(station)
+                aggregate['active_stations'].add(station)
         
         # Analyze each time point
         for timestamp, data in time_aggregates.items():
@@ -381,16 +499,17 @@ class OperationalAlgorithms:
                 
                 # Recommend activation if ratio exceeds target
                 if ratio > target_ratio:
-                    detected.append({
-                        'timestamp': timestamp,
-                        'type': 'CHECKOUT_ACTION',
-                        'Action': 'Open',
-                        'reason': f'Customer ratio {ratio:.1f} exceeds target {target_ratio}',
-                        'current_stations': active_count,
-                        'total_customers': total_customers,
-                        'risk_score': min(50 + (ratio - target_ratio) * 5, 90),
-                        'severity': 'MEDIUM'
-                    })
+                    risk_score = 50 + (ratio - target_ratio) * 5
+                    detected.append(CheckoutActionEvent(
+                        timestamp=timestamp,
+                        type='CHECKOUT_ACTION',
+                        Action='Open',
+                        reason=f'Customer ratio {ratio:.1f} exceeds target {target_ratio}',
+                        current_stations=active_count,
+                        total_customers=total_customers,
+                        risk_score=90 if risk_score > 90 else risk_score,
+                        severity='MEDIUM'
+                    ))
         
         return detected
 
@@ -419,70 +538,96 @@ class InventoryAlgorithms:
         """
         detected = []
         
-        # Start with initial inventory
-        expected_inventory = inventory_snapshot.copy()
+        # Dense per-SKU counters, indexed by position in the snapshot
+        sku_to_id = {sku: i for i, sku in enumerate(inventory_snapshot)}
+        
+        # Start with initial inventory (a plain list, so snapshot counts keep
+        # their own type, e.g. float or beyond 32 bits, as with the dict copy)
+        expected_inventory = list(inventory_snapshot.values())
         
         # Subtract POS transactions
         for pos in pos_events:
-            sku = pos['data']['sku']
-            if sku in expected_inventory:
-                expected_inventory[sku] -= 1
+            idx = sku_to_id.get(pos['data']['sku'])
+            if idx is not None:
+                expected_inventory[idx] -= 1
         
         # Count RFID detected items
-        rfid_inventory = defaultdict(int)
+        rfid_inventory = array('q', [0]) * len(sku_to_id)
         for rfid in rfid_events:
             sku = rfid['data'].get('sku')
             location = rfid['data'].get('location')
-            if sku and location in ['IN_SCAN_AREA', 'SHELF']:
-                rfid_inventory[sku] += 1
+            if sku and location in _INVENTORY_LOCATIONS:
+                idx = sku_to_id.get(sku)
+                if idx is not None:
+                    rfid_inventory[idx] += 1
+        
+        # Use latest timestamp
+        timestamp = rfid_events[-1]['timestamp'] if rfid_events else datetime.now().isoformat()
         
         # Compare and detect discrepancies
-        for sku, expected_count in expected_inventory.items():
-            actual_count = rfid_inventory.get(sku, 0)
+        for sku, idx in sku_to_id.items():
+            expected_count = expected_inventory[idx]
+            actual_count = rfid_inventory[idx]
             
             if expected_count > 0:
                 diff_percent = abs(actual_count - expected_count) / expected_count * 100
                 
                 if diff_percent > threshold_percent:
-                    risk_score = min(50 + diff_percent * 1.1, 95)
-                    
-                    # Use latest timestamp
-                    timestamp = rfid_events[-1]['timestamp'] if rfid_events else datetime.now().isoformat()
+                    risk_score = 50 + diff_percent * 1.1
+                    if risk_score > 95:
+                        risk_score = 95
                     
-                    detected.append({
-                        'timestamp': timestamp,
-                        'type': 'INVENTORY_DISCREPANCY',
-                        'SKU': sku,
-                        'Expected_Inventory': expected_count,
-                        'Actual_Inventory': actual_count,
-                        'Difference': actual_count - expected_count,
-                        'Difference_Percent': round(diff_percent, 2),
-                        'risk_score': round(risk_score, 1),
-                        'severity': self._classify_severity(risk_score)
-                    })
+                    detected.append(InventoryDiscrepancyEvent(
+                        timestamp=timestamp,
+                        type='INVENTORY_DISCREPANCY',
+                        SKU=sku,
+                        Expected_Inventory=expected_count,
+                        Actual_Inventory=actual_count,
+                        Difference=actual_count - expected_count,
+                        Difference_Percent=round(diff_percent, 2),
+                        risk_score=round(risk_score, 1),
+                        severity=self._classify_severity(risk_score)
+                    ))
         
         return detected
     
     # @algorithm Multi-Source Validation | Validates transactions where all systems (RFID, POS, Camera) agree for baseline metrics
     def track_successful_operations(self, pos_events: List[Dict], rfid_events: List[Dict],
-                                   recognition_events: List[Dict]) -> List[Dict]:
+                                   recognition_events: List[Dict],
+                                   time_window: Optional[int] = None) -> List[Dict]:
         """
         Multi-Source Validation Algorithm
         Method: Three-way data correlation for transaction validation
+        
+        By default readings must share the POS timestamp exactly; with a
+        time_window (seconds) a POS line succeeds when an RFID read and a
+        recognition of its SKU at the same station both fall within that many
+        seconds either side of it (the window the scanner avoidance check uses).
         """
+        if time_window is not None:
+            return self._track_successful_operations_windowed(
+                pos_events, rfid_events, recognition_events, time_window)
+        
         successful = []
         
-        # Index RFID and recognition by timestamp/station
+        # Build side: POS is the smallest stream, so hash its keys once and stream
+        # the larger RFID/recognition feeds through as probes
+        pos_keys = {(pos['timestamp'], pos['station_id']) for pos in pos_events}
+        
+        # Index RFID and recognition by timestamp/station (POS-matched keys only)
         rfid_index = {}
         for rfid in rfid_events:
-            if rfid['data'].get('sku'):
+            sku = rfid['data'].get('sku')
+            if sku:
                 key = (rfid['timestamp'], rfid['station_id'])
-                rfid_index[key] = rfid['data']['sku']
+                if key in pos_keys:
+                    rfid_index[key] = sku
         
         recognition_index = {}
         for recog in recognition_events:
             key = (recog['timestamp'], recog['station_id'])
-            recognition_index[key] = recog['data']['predicted_product']
+            if key in pos_keys:
+                recognition_index[key] = recog['data']['predicted_product']
         
         # Check POS transactions
         for pos in pos_events:
@@ -494,15 +639,73 @@ class InventoryAlgorithms:
             
             # All systems agree
             if rfid_sku == recog_sku == pos_sku:
-                successful.append({
-                    'timestamp': pos['timestamp'],
-                    'type': 'SUCCESS',
-                    'station_id': pos['station_id'],
-                    'customer_id': pos['data']['customer_id'],
-                    'product_sku': pos_sku,
-                    'service_score': 95,
-                    'risk_score': 5.0,
-                    'severity': 'LOW'
-                })
+                successful.append(SuccessEvent(
+                    timestamp=pos['timestamp'],
+                    type='SUCCESS',
+                    station_id=pos['station_id'],
+                    customer_id=pos['data']['customer_id'],
+                    product_sku=pos_sku,
+                    service_score=95,
+                    risk_score=5.0,
+                    severity='LOW'
+                ))
+        
+        return successful
+    
+    def _track_successful_operations_windowed(self, pos_events: List[Dict], rfid_events: List[Dict],
+                                              recognition_events: List[Dict],
+                                              time_window: int) -> List[Dict]:
+        """Match POS lines to RFID/recognition readings of the same SKU within the window"""
+        window = round(time_window * _NS_PER_SECOND)
+        successful = []
+        event_time_ns = DataLoader.event_time_ns_getter()
+        
+        # Sorted reading times per (station, sku), as in the scanner avoidance check;
+        # readings without a parseable time are skipped
+        def index_times(readings):
+            index = defaultdict(list)
+            for time, station, sku in readings:
+                if time is not None:
+                    index[(station, sku)].append(time)
+            for times in index.values():
+                times.sort()
+            return index
+        
+        rfid_times = index_times(
+            (event_time_ns(rfid), rfid['station_id'], rfid['data'].get('sku'))
+            for rfid in rfid_events if rfid['data'].get('sku')
+        )
+        recognition_times = index_times(
+            (event_time_ns(recog), recog['station_id'], recog['data']['predicted_product'])
+            for recog in recognition_events
+        )
+        
+        def seen(times, pos_time):
+            if not times:
+                return False
+            i = bisect_left(times, pos_time - window)
+            return i < len(times) and times[i] <= pos_time + window
+        
+        for pos in pos_events:
+            pos_time = event_time_ns(pos)
+            if pos_time is None:
+                continue
+            
+            station = pos['station_id']
+            pos_sku = pos['data']['sku']
+            key = (station, pos_sku)
+            
+            # All systems agree
+            if seen(rfid_times.get(key), pos_time) and seen(recognition_times.get(key), pos_time):
+                successful.append(SuccessEvent(
+                    timestamp=pos['timestamp'],
+                    type='SUCCESS',
+                    station_id=station,
+                    customer_id=pos['data']['customer_id'],
+                    product_sku=pos_sku,
+                    service_score=95,
+                    risk_score=5.0,
+                    severity='LOW'
+                ))
         
         return successful
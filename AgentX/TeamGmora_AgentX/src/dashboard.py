@@ -3,68 +3,460 @@ Sentinel Dashboard - Executive Retail Intelligence Platform
 Modern Material Design UI with Advanced Analytics
 Auto-reloads events file when modified
 """
-import json
 import os
+import sys
+import threading
 from pathlib import Path
-from flask import Flask, jsonify, render_template_string, request
+from flask import Flask, Response, jsonify, render_template_string, request
 from flask_cors import CORS
-from collections import defaultdict
-from typing import Dict, List, Any
+from collections import Counter
+from collections.abc import Sequence
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Any
 from datetime import datetime
 import random
 
+import orjson
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:  # optional; without it requests re-check the file's mtime
+    Observer = None
+
 app = Flask(__name__)
 CORS(app)
 
+# Optional on-disk dashboard page (the embedded DASHBOARD_HTML is the fallback)
+TEMPLATE_PATH = Path(__file__).parent / 'templates' / 'dashboard.html'
+
+# Event categories by event_id
+FRAUD_EVENT_IDS = frozenset(('E001', 'E002', 'E003'))
+OPERATIONAL_EVENT_IDS = frozenset(('E004', 'E005', 'E006', 'E008'))
+INVENTORY_EVENT_IDS = frozenset(('E007',))
+
 # Global storage for events and file tracking
-EVENTS_DATA = []
 EVENTS_FILE = None
-LAST_MODIFIED_TIME = None
+LAST_MODIFIED_TIME = None  # st_mtime_ns of the last load
+
+# Tail-reload bookkeeping: bytes consumed so far, the bytes just before that
+# offset (to detect rewrites) and the file identity they belong to
+EVENTS_OFFSET = 0
+EVENTS_TAIL = b''
+EVENTS_INODE = None
+_TAIL_CHECK_BYTES = 64
+
+# Serializes reloads triggered from concurrent request threads
+_RELOAD_LOCK = threading.Lock()
+
+# watchdog observer reloading EVENTS_FILE on change (None when polling)
+EVENTS_WATCHER = None
+
+# Encoded /api/events responses kept per snapshot, keyed by query filters
+_EVENTS_RESPONSE_CACHE_SIZE = 32
+
+# Approximate bytes of JSONL parsed and folded into the metrics per batch
+_READ_CHUNK_BYTES = 1 << 20
+
+
+def parse_events(data: bytes) -> List[Dict[str, Any]]:
+    """Parse JSONL bytes into event dicts"""
+    return parse_event_lines(data.splitlines())
+
+
+def parse_event_lines(lines: Iterable[bytes]) -> List[Dict[str, Any]]:
+    """Parse JSONL lines into event dicts"""
+    events = []
+    for line in lines:
+        line = line.strip()
+        if line:
+            event = orjson.loads(line)
+            # Intern the low-cardinality category keys so set/dict
+            # lookups on them compare by identity
+            event_id = event.get('event_id')
+            if type(event_id) is str:
+                event['event_id'] = sys.intern(event_id)
+            event_data = event.get('event_data')
+            if type(event_data) is dict and type(event_data.get('event_name')) is str:
+                event_data['event_name'] = sys.intern(event_data['event_name'])
+            events.append(event)
+    return events
 
 
 def load_events_from_file(filepath: str, force_reload: bool = False):
-    """Load events from JSONL file with auto-reload on modification"""
-    global EVENTS_DATA, LAST_MODIFIED_TIME
+    """Load events from JSONL file with auto-reload on modification
     
-    try:
-        # Check if file exists
-        if not os.path.exists(filepath):
+    When the file has only been appended to since the last load, just the new
+    tail is parsed and folded into the running metrics; otherwise (first load,
+    forced, truncated or rewritten file) everything is reloaded. A last line
+    still being written is left unread until it is complete. Reloads are
+    serialized, and the result is published by rebinding DASHBOARD_STATE in a
+    single assignment so request handlers always see a consistent snapshot.
+    """
+    global DASHBOARD_STATE, LAST_MODIFIED_TIME, METRICS_STATE
+    global EVENTS_OFFSET, EVENTS_TAIL, EVENTS_INODE
+    
+    with _RELOAD_LOCK:
+        try:
+            # Get current modification time (integer ns, compared exactly;
+            # a missing file raises FileNotFoundError)
+            stat = os.stat(filepath)
+            current_mtime = stat.st_mtime_ns
+            
+            # Reload if forced or if file was modified (size catches writes
+            # landing within the same mtime tick)
+            if not (force_reload or LAST_MODIFIED_TIME is None or current_mtime != LAST_MODIFIED_TIME
+                    or stat.st_size != EVENTS_OFFSET):
+                return
+            
+            # Only growth counts as an append: a changed mtime at the same size
+            # (e.g. rewritten in place with same-length content) reloads fully
+            append_only = (
+                not force_reload
+                and METRICS_STATE is not None
+                and LAST_MODIFIED_TIME is not None
+                and stat.st_ino == EVENTS_INODE
+                and stat.st_size > EVENTS_OFFSET
+            )
+            
+            with open(filepath, 'rb') as f:
+                if append_only and EVENTS_TAIL:
+                    f.seek(EVENTS_OFFSET - len(EVENTS_TAIL))
+                    append_only = f.read(len(EVENTS_TAIL)) == EVENTS_TAIL
+                
+                if append_only:
+                    f.seek(EVENTS_OFFSET)
+                    start = EVENTS_OFFSET
+                    metrics_state = METRICS_STATE
+                else:
+                    f.seek(0)
+                    start = 0
+                    metrics_state = MetricsAccumulator()
+                
+                # A failure while folding leaves the accumulator half-updated;
+                # drop it so the next reload starts from scratch
+                METRICS_STATE = None
+                
+                # Parse and fold in bounded batches of whole lines, so the raw
+                # file contents are never held in memory all at once
+                loaded_before = metrics_state.total_events
+                while True:
+                    lines = f.readlines(_READ_CHUNK_BYTES)
+                    if not lines:
+                        break
+                    
+                    # Only the line at EOF can be unterminated: keep it if it is a
+                    # complete event, else leave it for the reload after the writer
+                    # finishes it
+                    partial = None if lines[-1].endswith(b'\n') else lines.pop()
+                    metrics_state.add_events(parse_event_lines(lines))
+                    if partial is not None:
+                        try:
+                            events = parse_event_lines((partial,))
+                        except orjson.JSONDecodeError:
+                            f.seek(-len(partial), os.SEEK_CUR)
+                            break
+                        metrics_state.add_events(events)
+                
+                offset = f.tell()
+                if offset > start:
+                    f.seek(max(0, offset - _TAIL_CHECK_BYTES))
+                    tail = f.read(offset - f.tell())
+                else:
+                    tail = EVENTS_TAIL if append_only else b''
+            
+            METRICS_STATE = metrics_state
+            DASHBOARD_STATE = build_dashboard_state(metrics_state)
+            EVENTS_OFFSET, EVENTS_TAIL, EVENTS_INODE = offset, tail, stat.st_ino
+            LAST_MODIFIED_TIME = current_mtime
+            
+            updated = datetime.fromtimestamp(stat.st_mtime).strftime('%Y-%m-%d %H:%M:%S')
+            total = metrics_state.total_events
+            if append_only:
+                print(f"✓ Appended {total - loaded_before} events ({total} total) for dashboard (Updated: {updated})")
+            else:
+                print(f"✓ Loaded {total} events for dashboard (Updated: {updated})")
+            
+        except FileNotFoundError:
             print(f"⚠ Events file not found: {filepath}")
-            return
+        except Exception as e:
+            print(f"⚠ Error loading events: {e}")
+
+
+def refresh_events():
+    """Reload EVENTS_FILE if it changed, unless a file watcher already does"""
+    if EVENTS_FILE and not (EVENTS_WATCHER is not None and EVENTS_WATCHER.is_alive()):
+        load_events_from_file(EVENTS_FILE)
+
+
+def start_file_watcher(filepath: str):
+    """Reload the events file whenever it changes on disk (needs watchdog)
+    
+    The parent directory is watched so files replaced by rename are picked up
+    too. Returns the running observer, or None if watchdog is not installed.
+    """
+    if Observer is None:
+        return None
+    
+    target = os.path.abspath(filepath)
+    
+    class EventsFileHandler(FileSystemEventHandler):
+        def on_any_event(self, event):
+            if event.is_directory:
+                return
+            if target in (event.src_path, getattr(event, 'dest_path', None)):
+                load_events_from_file(target)
+    
+    observer = Observer()
+    observer.daemon = True
+    observer.schedule(EventsFileHandler(), os.path.dirname(target), recursive=False)
+    observer.start()
+    return observer
+
+
+class ListPrefix(Sequence):
+    """Read-only view of the first `length` items of an append-only list
+    
+    Published snapshots share the loader's growing lists instead of copying
+    them, so a tail reload costs O(new events); items appended after the view
+    was taken stay invisible. Slicing returns a new list (e.g. view[:] for a
+    JSON-serializable copy).
+    """
+    __slots__ = ('_items', '_length')
+    
+    def __init__(self, items: List[Any]):
+        self._items = items
+        self._length = len(items)
+    
+    def __len__(self) -> int:
+        return self._length
+    
+    def __iter__(self) -> Iterator[Any]:
+        return islice(self._items, self._length)
+    
+    def __getitem__(self, index):
+        length = self._length
+        if isinstance(index, slice):
+            start, stop, step = index.indices(length)
+            if step == 1:
+                return self._items[start:stop]
+            return [self._items[i] for i in range(start, stop, step)]
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError('ListPrefix index out of range')
+        return self._items[index]
+
+
+class MetricsAccumulator:
+    """Running summary/analytics aggregates that can be extended with new events"""
+    
+    def __init__(self):
+        self.total_events = 0
+        # Every event folded in so far, in file order (lists here are only
+        # ever appended to, so snapshots can share them via ListPrefix)
+        self.events = []
+        self.event_counts = Counter()
+        self.severity_counts = Counter()
         
-        # Get current modification time
-        current_mtime = os.path.getmtime(filepath)
+        # Station statistics as dense columns indexed by a per-station code
+        self.station_codes = {}
+        self.station_total = []
+        self.station_fraud = []
+        self.station_customers = []
+        self.station_events = []
         
-        # Reload if forced or if file was modified
-        if force_reload or LAST_MODIFIED_TIME is None or current_mtime > LAST_MODIFIED_TIME:
-            EVENTS_DATA = []
-            with open(filepath, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if line:
-                        EVENTS_DATA.append(json.loads(line))
+        # Events per category, in file order
+        self.fraud_events = []
+        self.operational_events = []
+        self.inventory_events = []
+        
+        # Time-based statistics, one slot per hour of day; each distinct timestamp
+        # string is parsed once (-1 marks unparseable)
+        self.hourly_events = [0] * 24
+        self.hour_cache = {}
+    
+    def add_events(self, events: List[Dict[str, Any]]):
+        """Fold events into the running aggregates"""
+        station_codes_get = self.station_codes.get
+        station_codes = self.station_codes
+        station_total = self.station_total
+        station_fraud = self.station_fraud
+        station_customers = self.station_customers
+        station_events = self.station_events
+        add_fraud = self.fraud_events.append
+        add_operational = self.operational_events.append
+        add_inventory = self.inventory_events.append
+        
+        self.events.extend(events)
+        
+        # Event-type histogram in one C-level Counter pass
+        self.event_counts.update([event['event_data'].get('event_name', 'Unknown') for event in events])
+        
+        fraud = operational = inventory = 0
+        for event in events:
+            event_data = event['event_data']
+            event_id = event.get('event_id', '')
             
-            LAST_MODIFIED_TIME = current_mtime
-            print(f"✓ Loaded {len(EVENTS_DATA)} events for dashboard (Updated: {datetime.fromtimestamp(current_mtime).strftime('%Y-%m-%d %H:%M:%S')})")
+            # Estimate severity from event_id
+            is_fraud = event_id in FRAUD_EVENT_IDS
+            if is_fraud:
+                fraud += 1
+                add_fraud(event)
+            elif event_id in OPERATIONAL_EVENT_IDS:
+                operational += 1
+                add_operational(event)
+            elif event_id in INVENTORY_EVENT_IDS:
+                inventory += 1
+                add_inventory(event)
+            
+            station_id = event_data.get('station_id')
+            if station_id:
+                code = station_codes_get(station_id)
+                if code is None:
+                    code = station_codes[station_id] = len(station_total)
+                    station_total.append(0)
+                    station_fraud.append(0)
+                    station_customers.append(set())
+                    station_events.append([])
+                
+                station_events[code].append(event)
+                station_total[code] += 1
+                if is_fraud:
+                    station_fraud[code] += 1
+                
+                customer_id = event_data.get('customer_id')
+                if customer_id:
+                    station_customers[code].add(customer_id)
         
-    except FileNotFoundError:
-        print(f"⚠ Events file not found: {filepath}")
-    except Exception as e:
-        print(f"⚠ Error loading events: {e}")
+        # Time distribution: count each distinct timestamp, then bucket by hour
+        hourly_events = self.hourly_events
+        hour_cache = self.hour_cache
+        for timestamp, count in Counter([event.get('timestamp') for event in events]).items():
+            hour = hour_cache.get(timestamp)
+            if hour is None:
+                try:
+                    hour = datetime.fromisoformat(timestamp).hour
+                except (TypeError, ValueError):
+                    hour = -1
+                hour_cache[timestamp] = hour
+            if hour >= 0:
+                hourly_events[hour] += count
+        
+        severity_counts = self.severity_counts
+        severity_counts['FRAUD'] += fraud
+        severity_counts['OPERATIONAL'] += operational
+        severity_counts['INVENTORY'] += inventory
+        severity_counts['NORMAL'] += len(events) - fraud - operational - inventory
+        self.total_events += len(events)
+    
+    def events_by_station(self) -> Dict[str, ListPrefix]:
+        """Views of the per-station event lists, in first-seen station order"""
+        station_events = self.station_events
+        return {station: ListPrefix(station_events[code]) for station, code in self.station_codes.items()}
+    
+    def events_by_category(self) -> Dict[str, ListPrefix]:
+        """Views of the fraud/operational/inventory event lists"""
+        return {
+            'fraud': ListPrefix(self.fraud_events),
+            'operational': ListPrefix(self.operational_events),
+            'inventory': ListPrefix(self.inventory_events)
+        }
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Build the /api/summary and /api/analytics payloads"""
+        total_events = self.total_events
+        severity_counts = self.severity_counts
+        station_codes = self.station_codes
+        station_total = self.station_total
+        
+        # Convert columns to per-station records
+        station_summary = {}
+        for station, code in station_codes.items():
+            total = station_total[code]
+            fraud = self.station_fraud[code]
+            station_summary[station] = {
+                'total': total,
+                'fraud': fraud,
+                'operational': total - fraud,
+                'unique_customers': len(self.station_customers[code]),
+                'fraud_rate': round((fraud / total * 100), 2) if total > 0 else 0
+            }
+        
+        return {
+            'summary': {
+                'total_events': total_events,
+                'event_breakdown': dict(self.event_counts),
+                'severity_breakdown': {k: v for k, v in severity_counts.items() if v},
+                'station_breakdown': {station: station_total[code] for station, code in station_codes.items()},
+                'fraud_events': severity_counts.get('FRAUD', 0),
+                'operational_events': severity_counts.get('OPERATIONAL', 0),
+                'inventory_events': severity_counts.get('INVENTORY', 0),
+                'normal_events': severity_counts.get('NORMAL', 0)
+            },
+            'analytics': {
+                'total_events': total_events,
+                'station_stats': station_summary,
+                'hourly_distribution': {hour: count for hour, count in enumerate(self.hourly_events) if count},
+                'event_type_distribution': dict(self.event_counts),
+                'active_stations': list(station_codes),
+                'avg_events_per_station': round(total_events / len(station_codes), 2) if station_codes else 0
+            }
+        }
+
+
+def calculate_metrics(events: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Single pass over events computing the summary and analytics aggregates"""
+    state = MetricsAccumulator()
+    state.add_events(events)
+    return state.snapshot()
+
+
+def encode_json(payload: Any) -> bytes:
+    """Serialize a payload exactly as jsonify() would"""
+    return app.json.response(payload).get_data()
+
+
+def build_dashboard_state(metrics_state: MetricsAccumulator) -> Dict[str, Any]:
+    """Build the published snapshot, pre-encoding the metric payloads"""
+    metrics = metrics_state.snapshot()
+    return {
+        'events': ListPrefix(metrics_state.events),
+        'events_by_station': metrics_state.events_by_station(),
+        'events_by_category': metrics_state.events_by_category(),
+        'metrics': metrics,
+        'summary_json': encode_json(metrics['summary']),
+        'analytics_json': encode_json(metrics['analytics']),
+        'events_json': {},
+        'station_json': {}
+    }
+
+
+def json_response(data: bytes) -> Response:
+    """Wrap already-encoded JSON in a response"""
+    return Response(data, mimetype=app.json.mimetype)
+
+
+# Running aggregates for the loaded file (owned by the loader, under _RELOAD_LOCK)
+METRICS_STATE = None
+
+# Published snapshot read by the API handlers: the loaded events, the
+# /api/summary, /api/analytics payloads built from them and their encoded
+# responses. Replaced wholesale on reload, so cached bytes never go stale;
+# handlers should read it once per request.
+DASHBOARD_STATE = build_dashboard_state(MetricsAccumulator())
 
 
 @app.route('/')
 def index():
     """Main dashboard page - Executive Daisy UI Interface"""
-    if EVENTS_FILE:
-        load_events_from_file(EVENTS_FILE)
+    refresh_events()
     
     # Load the dashboard template
-    template_path = Path(__file__).parent / 'templates' / 'dashboard.html'
-    if template_path.exists():
-        with open(template_path, 'r', encoding='utf-8') as f:
+    try:
+        with open(TEMPLATE_PATH, 'r', encoding='utf-8') as f:
             return f.read()
-    else:
+    except FileNotFoundError:
         # Fallback to embedded template
         return render_template_string(DASHBOARD_HTML)
 
@@ -73,57 +465,30 @@ def index():
 def api_summary():
     """API: Get overall summary statistics (auto-reloads data)"""
     # Auto-reload events if file was modified
-    if EVENTS_FILE:
-        load_events_from_file(EVENTS_FILE)
+    refresh_events()
     
-    event_counts = defaultdict(int)
-    severity_counts = defaultdict(int)
-    station_counts = defaultdict(int)
-    
-    for event in EVENTS_DATA:
-        event_name = event['event_data'].get('event_name', 'Unknown')
-        event_counts[event_name] += 1
-        
-        station_id = event['event_data'].get('station_id')
-        if station_id:
-            station_counts[station_id] += 1
-        
-        # Estimate severity from event_id
-        event_id = event.get('event_id', '')
-        if event_id in ['E001', 'E002', 'E003']:
-            severity_counts['FRAUD'] += 1
-        elif event_id in ['E004', 'E005', 'E006', 'E008']:
-            severity_counts['OPERATIONAL'] += 1
-        elif event_id == 'E007':
-            severity_counts['INVENTORY'] += 1
-        else:
-            severity_counts['NORMAL'] += 1
-    
-    return jsonify({
-        'total_events': len(EVENTS_DATA),
-        'event_breakdown': dict(event_counts),
-        'severity_breakdown': dict(severity_counts),
-        'station_breakdown': dict(station_counts),
-        'fraud_events': severity_counts['FRAUD'],
-        'operational_events': severity_counts['OPERATIONAL'],
-        'inventory_events': severity_counts['INVENTORY'],
-        'normal_events': severity_counts['NORMAL']
-    })
+    return json_response(DASHBOARD_STATE['summary_json'])
 
 
 @app.route('/api/events')
 def api_all_events():
     """API: Get all events with optional filtering (auto-reloads data)"""
     # Auto-reload events if file was modified
-    if EVENTS_FILE:
-        load_events_from_file(EVENTS_FILE)
+    refresh_events()
     
     # Query parameters for filtering
     event_type = request.args.get('event_type')
     station_id = request.args.get('station_id')
     limit = request.args.get('limit', type=int)
     
-    filtered_events = EVENTS_DATA
+    state = DASHBOARD_STATE
+    cache = state['events_json']
+    cache_key = (event_type, station_id, limit)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return json_response(cached)
+    
+    filtered_events = state['events']
     
     # Apply filters
     if event_type:
@@ -138,21 +503,23 @@ def api_all_events():
             if e['event_data'].get('station_id') == station_id
         ]
     
-    # Apply limit
-    if limit:
-        filtered_events = filtered_events[:limit]
+    # Apply limit (slicing also copies the shared snapshot view into a list)
+    filtered_events = filtered_events[:limit] if limit else filtered_events[:]
     
-    return jsonify({
+    data = encode_json({
         'total': len(filtered_events),
         'events': filtered_events
     })
+    if len(cache) < _EVENTS_RESPONSE_CACHE_SIZE:
+        cache[cache_key] = data
+    return json_response(data)
 
 
 @app.route('/api/events/<event_type>')
 def api_events_by_type(event_type: str):
     """API: Get events filtered by event type"""
     filtered_events = [
-        e for e in EVENTS_DATA
+        e for e in DASHBOARD_STATE['events']
         if e['event_data'].get('event_name') == event_type
     ]
     
@@ -166,20 +533,10 @@ def api_events_by_type(event_type: str):
 @app.route('/api/stations')
 def api_stations():
     """API: Get all stations with their event counts"""
-    station_events = defaultdict(list)
-    
-    for event in EVENTS_DATA:
-        station_id = event['event_data'].get('station_id')
-        if station_id:
-            station_events[station_id].append(event)
-    
     stations = []
-    for station_id, events in station_events.items():
+    for station_id, events in DASHBOARD_STATE['events_by_station'].items():
         # Count event types
-        event_type_counts = defaultdict(int)
-        for event in events:
-            event_name = event['event_data'].get('event_name', 'Unknown')
-            event_type_counts[event_name] += 1
+        event_type_counts = Counter([e['event_data'].get('event_name', 'Unknown') for e in events])
         
         stations.append({
             'station_id': station_id,
@@ -197,72 +554,61 @@ def api_stations():
 @app.route('/api/stations/<station_id>')
 def api_station_details(station_id: str):
     """API: Get detailed information for a specific station"""
-    station_events = [
-        e for e in EVENTS_DATA
-        if e['event_data'].get('station_id') == station_id
-    ]
+    state = DASHBOARD_STATE
+    cached = state['station_json'].get(station_id)
+    if cached is not None:
+        return json_response(cached)
     
-    # Count event types
-    event_type_counts = defaultdict(int)
-    fraud_count = 0
+    station_events = state['events_by_station'].get(station_id, [])
     
-    for event in station_events:
-        event_name = event['event_data'].get('event_name', 'Unknown')
-        event_type_counts[event_name] += 1
-        
-        if event.get('event_id') in ['E001', 'E002', 'E003']:
-            fraud_count += 1
+    # Count event types
+    event_type_counts = Counter([e['event_data'].get('event_name', 'Unknown') for e in station_events])
+    fraud_count = sum(1 for e in station_events if e.get('event_id') in FRAUD_EVENT_IDS)
     
-    return jsonify({
+    data = encode_json({
         'station_id': station_id,
         'total_events': len(station_events),
         'fraud_events': fraud_count,
         'event_breakdown': dict(event_type_counts),
-        'events': station_events
+        'events': station_events[:]
     })
+    
+    # Only known stations are cached, so arbitrary ids can't grow the cache
+    if station_events:
+        state['station_json'][station_id] = data
+    return json_response(data)
 
 
 @app.route('/api/fraud')
 def api_fraud_events():
     """API: Get all fraud-related events"""
-    fraud_event_ids = ['E001', 'E002', 'E003']
-    fraud_events = [
-        e for e in EVENTS_DATA
-        if e.get('event_id') in fraud_event_ids
-    ]
+    fraud_events = DASHBOARD_STATE['events_by_category']['fraud']
     
     return jsonify({
         'total_fraud_events': len(fraud_events),
-        'events': fraud_events
+        'events': fraud_events[:]
     })
 
 
 @app.route('/api/operational')
 def api_operational_events():
     """API: Get all operational issue events"""
-    operational_event_ids = ['E004', 'E005', 'E006', 'E008']
-    operational_events = [
-        e for e in EVENTS_DATA
-        if e.get('event_id') in operational_event_ids
-    ]
+    operational_events = DASHBOARD_STATE['events_by_category']['operational']
     
     return jsonify({
         'total_operational_events': len(operational_events),
-        'events': operational_events
+        'events': operational_events[:]
     })
 
 
 @app.route('/api/inventory')
 def api_inventory_events():
     """API: Get all inventory-related events"""
-    inventory_events = [
-        e for e in EVENTS_DATA
-        if e.get('event_id') == 'E007'
-    ]
+    inventory_events = DASHBOARD_STATE['events_by_category']['inventory']
     
     return jsonify({
         'total_inventory_events': len(inventory_events),
-        'events': inventory_events
+        'events': inventory_events[:]
     })
 
 
@@ -270,71 +616,9 @@ def api_inventory_events():
 def api_analytics():
     """API: Get advanced analytics data"""
     # Auto-reload events if file was modified
-    if EVENTS_FILE:
-        load_events_from_file(EVENTS_FILE)
-    
-    # Calculate analytics
-    total_events = len(EVENTS_DATA)
-    
-    # Station statistics
-    station_stats = defaultdict(lambda: {
-        'total': 0,
-        'fraud': 0,
-        'operational': 0,
-        'customers': set()
-    })
+    refresh_events()
     
-    # Time-based statistics
-    hourly_events = defaultdict(int)
-    
-    # Event type distribution
-    event_types = defaultdict(int)
-    
-    for event in EVENTS_DATA:
-        station_id = event['event_data'].get('station_id')
-        event_id = event.get('event_id', '')
-        event_name = event['event_data'].get('event_name', 'Unknown')
-        
-        if station_id:
-            station_stats[station_id]['total'] += 1
-            if event_id in ['E001', 'E002', 'E003']:
-                station_stats[station_id]['fraud'] += 1
-            else:
-                station_stats[station_id]['operational'] += 1
-            
-            customer_id = event['event_data'].get('customer_id')
-            if customer_id:
-                station_stats[station_id]['customers'].add(customer_id)
-        
-        # Time distribution
-        try:
-            timestamp = datetime.fromisoformat(event['timestamp'])
-            hour = timestamp.hour
-            hourly_events[hour] += 1
-        except:
-            pass
-        
-        event_types[event_name] += 1
-    
-    # Convert sets to counts
-    station_summary = {}
-    for station, stats in station_stats.items():
-        station_summary[station] = {
-            'total': stats['total'],
-            'fraud': stats['fraud'],
-            'operational': stats['operational'],
-            'unique_customers': len(stats['customers']),
-            'fraud_rate': round((stats['fraud'] / stats['total'] * 100), 2) if stats['total'] > 0 else 0
-        }
-    
-    return jsonify({
-        'total_events': total_events,
-        'station_stats': station_summary,
-        'hourly_distribution': dict(hourly_events),
-        'event_type_distribution': dict(event_types),
-        'active_stations': list(station_stats.keys()),
-        'avg_events_per_station': round(total_events / len(station_stats), 2) if station_stats else 0
-    })
+    return json_response(DASHBOARD_STATE['analytics_json'])
 
 
 # Dashboard HTML Template
@@ -733,7 +1017,7 @@ DASHBOARD_HTML = """
 
 def start_dashboard(events_file: str, host: str = '0.0.0.0', port: int = 5000):
     """Start the dashboard server"""
-    global EVENTS_FILE
+    global EVENTS_FILE, EVENTS_WATCHER
     EVENTS_FILE = events_file
     
     print("\n" + "="*70)
@@ -742,6 +1026,12 @@ def start_dashboard(events_file: str, host: str = '0.0.0.0', port: int = 5000):
     
     load_events_from_file(events_file)
     
+    EVENTS_WATCHER = start_file_watcher(events_file)
+    if EVENTS_WATCHER is not None:
+        print(f"✓ Watching {events_file} for changes")
+    else:
+        print("✓ Checking events file for changes on each request (install watchdog to watch it)")
+    
     print(f"\n✅ Dashboard running at http://localhost:{port}")
     print(f"✅ API endpoints available at http://localhost:{port}/api/*")
     print("\nPress Ctrl+C to stop the server\n")
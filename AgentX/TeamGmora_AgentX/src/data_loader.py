@@ -1,11 +1,45 @@
 """
 Data Loader Module - Loads and merges data from multiple sources
 """
-import json
 import csv
+import sys
+from array import array
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, List, Any
-from datetime import datetime
+from typing import Callable, Collection, Dict, Iterator, List, Any, Optional, Sequence, Tuple
+from datetime import datetime, timedelta, timezone
+
+import orjson
+
+try:
+    from ciso8601 import parse_datetime as _parse_datetime
+except ImportError:  # optional C parser; fromisoformat handles the same ISO stamps
+    _parse_datetime = datetime.fromisoformat
+
+# Join-key fields interned at load time: the same timestamp/station strings repeat
+# across every stream, so interning shares one object and lets dict probes on
+# (timestamp, station_id) keys short-circuit on identity
+_INTERNED_FIELDS = ('timestamp', 'station_id')
+
+# Loaded events also carry their timestamp as integer epoch nanoseconds under
+# this key, so detectors compare and subtract ints (never part of the output)
+TIMESTAMP_NS_FIELD = '_ts_ns'
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+# Event files merged by merge_all_events, with the _source tag of each
+_EVENT_SOURCES = (
+    ('pos_transactions.jsonl', 'pos'),
+    ('rfid_readings.jsonl', 'rfid'),
+    ('product_recognition.jsonl', 'recognition'),
+    ('queue_monitoring.jsonl', 'queue'),
+    ('inventory_snapshots.jsonl', 'inventory'),
+)
+
+# Shared read-only fallback for missing nested payloads and catalogs, also used
+# by the detectors (never mutate)
+_EMPTY_DICT = {}
 
 
 class DataLoader:
@@ -13,28 +47,89 @@ class DataLoader:
     
     def __init__(self, data_dir: str):
         self.data_dir = Path(data_dir)
+        # Timestamp string -> epoch ns, shared by every file this loader reads
+        self._timestamp_ns = {}
         
     def load_jsonl_file(self, filename: str) -> List[Dict[str, Any]]:
         """Load JSONL file and return list of events"""
+        return list(self.load_jsonl_iter(filename))
+    
+    def load_jsonl_iter(self, filename: str) -> Iterator[Dict[str, Any]]:
+        """Yield events from a JSONL file one at a time (nothing if it is missing)"""
         file_path = self.data_dir / filename
-        events = []
+        timestamp_ns = self._timestamp_ns
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if line:
-                        events.append(json.loads(line))
+            f = open(file_path, 'rb')
         except FileNotFoundError:
             print(f"Warning: {filename} not found")
-            return []
+            return
         
-        return events
+        with f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    event = orjson.loads(line)
+                    for field in _INTERNED_FIELDS:
+                        value = event.get(field)
+                        if type(value) is str:
+                            event[field] = sys.intern(value)
+                    
+                    timestamp = event.get('timestamp')
+                    if type(timestamp) is str:
+                        ns = timestamp_ns.get(timestamp)
+                        if ns is None:
+                            ns = timestamp_ns[timestamp] = self._try_timestamp_ns(timestamp)
+                        if ns is not None:
+                            event[TIMESTAMP_NS_FIELD] = ns
+                    yield event
     
-    def load_csv_file(self, filename: str) -> List[Dict[str, Any]]:
-        """Load CSV file and return list of dictionaries"""
+    def load_jsonl_first(self, filename: str) -> Optional[Dict[str, Any]]:
+        """Load only the first event of a JSONL file (None if missing or empty)"""
+        events = self.load_jsonl_iter(filename)
+        try:
+            return next(events, None)
+        finally:
+            events.close()
+    
+    @staticmethod
+    def events_to_columns(events: List[Dict[str, Any]], fields: Sequence[str]) -> Dict[str, List[Any]]:
+        """Convert events into one column (list) per field
+        
+        Fields are dotted paths into each event (e.g. 'data.sku'); missing values
+        are None.
+        """
+        columns = {}
+        
+        for field in fields:
+            path = field.split('.')
+            values = None
+            
+            # Fast path for the common 'parent.child' field; any non-dict parent
+            # falls back to the general walk below
+            if len(path) == 2:
+                parent, child = path
+                try:
+                    values = [event.get(parent, _EMPTY_DICT).get(child) for event in events]
+                except AttributeError:
+                    values = None
+            
+            if values is None:
+                values = []
+                for event in events:
+                    value = event
+                    for part in path:
+                        value = value.get(part) if isinstance(value, dict) else None
+                    values.append(value)
+            
+            columns[field] = values
+        
+        return columns
+    
+    def load_csv_rows(self, filename: str) -> Tuple[List[str], List[List[str]]]:
+        """Load CSV file and return (header, rows) with rows as positional lists"""
         file_path = self.data_dir / filename
-        data = []
+        header, rows = [], []
         
         try:
             # Try utf-8-sig first to handle BOM, then fall back to utf-8
@@ -45,37 +140,103 @@ class DataLoader:
                         lines = [line for line in f if line.strip()]
                         if not lines:
                             continue
-                        reader = csv.DictReader(lines)
-                        data = list(reader)
+                        reader = csv.reader(lines)
+                        header = next(reader)
+                        rows = list(reader)
                         # Verify we got valid data with proper headers
-                        if data and any(key and key.strip() for key in data[0].keys()):
+                        if rows and any(key and key.strip() for key in header):
                             break
                 except (UnicodeDecodeError, csv.Error):
                     continue
         except FileNotFoundError:
             print(f"Warning: {filename} not found")
-            return []
+            return [], []
         
-        return data
+        return header, rows
+    
+    def load_csv_file(self, filename: str) -> List[Dict[str, Any]]:
+        """Load CSV file and return list of dictionaries"""
+        header, rows = self.load_csv_rows(filename)
+        return [dict(zip(header, row)) for row in rows]
     
     def load_products_catalog(self) -> Dict[str, Dict[str, Any]]:
         """Load products catalog indexed by SKU"""
-        products_list = self.load_csv_file('products_list.csv')
+        header, rows = self.load_csv_rows('products_list.csv')
         catalog = {}
+        if not rows:
+            return catalog
         
-        for product in products_list:
-            sku = product['SKU']
-            catalog[sku] = {
-                'product_name': product['product_name'],
-                'barcode': product['barcode'],
-                'weight': float(product['weight']),
-                'price': float(product['price']),
-                'quantity': int(product['quantity']),
-                'epc_range': product['EPC_range']
+        i_sku, i_name, i_barcode, i_weight, i_price, i_quantity, i_epc = (
+            header.index(column) for column in
+            ('SKU', 'product_name', 'barcode', 'weight', 'price', 'quantity', 'EPC_range')
+        )
+        
+        for row in rows:
+            catalog[row[i_sku]] = {
+                'product_name': row[i_name],
+                'barcode': row[i_barcode],
+                'weight': float(row[i_weight]),
+                'price': float(row[i_price]),
+                'quantity': int(row[i_quantity]),
+                'epc_range': row[i_epc]
             }
         
         return catalog
     
+    @staticmethod
+    def timestamp_ns(timestamp: str) -> int:
+        """Parse an ISO 8601 event timestamp into epoch nanoseconds (naive stamps as UTC)"""
+        value = _parse_datetime(timestamp)
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return (value - _EPOCH) // _MICROSECOND * 1000
+    
+    @staticmethod
+    def _try_timestamp_ns(timestamp: str) -> Optional[int]:
+        # Malformed stamps give None; detectors skip events without a time
+        try:
+            return DataLoader.timestamp_ns(timestamp)
+        except ValueError:
+            return None
+    
+    @staticmethod
+    def event_time_ns_getter() -> Callable[[Dict[str, Any]], Optional[int]]:
+        """Return a function giving an event's time in epoch nanoseconds
+        
+        Events from load_jsonl_file carry it precomputed; for any other event the
+        timestamp is parsed, memoized per string. Missing or malformed stamps
+        give None.
+        """
+        cache = {}
+        
+        def event_time_ns(event: Dict[str, Any]) -> Optional[int]:
+            value = event.get(TIMESTAMP_NS_FIELD)
+            if value is None:
+                timestamp = event.get('timestamp')
+                if type(timestamp) is not str:
+                    return None
+                try:
+                    value = cache[timestamp]
+                except KeyError:
+                    value = cache[timestamp] = DataLoader._try_timestamp_ns(timestamp)
+            return value
+        
+        return event_time_ns
+    
+    @staticmethod
+    def build_catalog_columns(catalog: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """Build a columnar view of the catalog: SKU -> id map plus weight/price arrays
+
+        Both are float64: weights feed the tolerance check and the emitted
+        difference_percent, so they must match the catalog values exactly.
+        """
+        skus = sorted(catalog)
+        return {
+            'sku_to_id': {sku: i for i, sku in enumerate(skus)},
+            'weight': array('d', (catalog[sku].get('weight', 0) for sku in skus)),
+            'price': array('d', (catalog[sku].get('price', 0) for sku in skus))
+        }
+    
     def load_customer_data(self) -> Dict[str, Dict[str, Any]]:
         """Load customer data indexed by Customer_ID"""
         customers_list = self.load_csv_file('customer_data.csv')
@@ -87,40 +248,23 @@ class DataLoader:
         
         return customers
     
-    def merge_all_events(self) -> List[Dict[str, Any]]:
-        """Load all events from different sources and merge them by timestamp"""
-        all_events = []
-        
-        # Load all event sources
-        pos_events = self.load_jsonl_file('pos_transactions.jsonl')
-        rfid_events = self.load_jsonl_file('rfid_readings.jsonl')
-        recognition_events = self.load_jsonl_file('product_recognition.jsonl')
-        queue_events = self.load_jsonl_file('queue_monitoring.jsonl')
-        inventory_events = self.load_jsonl_file('inventory_snapshots.jsonl')
-        
-        # Tag events with source type
-        for event in pos_events:
-            event['_source'] = 'pos'
-            all_events.append(event)
-        
-        for event in rfid_events:
-            event['_source'] = 'rfid'
-            all_events.append(event)
+    def merge_all_events(self, statuses: Optional[Collection[str]] = None) -> List[Dict[str, Any]]:
+        """Load all events from different sources and merge them by timestamp
         
-        for event in recognition_events:
-            event['_source'] = 'recognition'
-            all_events.append(event)
-        
-        for event in queue_events:
-            event['_source'] = 'queue'
-            all_events.append(event)
+        Each file is streamed; with statuses given, only events whose status is
+        one of them are kept (the rest are never held in memory).
+        """
+        all_events = []
         
-        for event in inventory_events:
-            event['_source'] = 'inventory'
-            all_events.append(event)
+        # Load all event sources, tagging events with source type
+        for filename, source in _EVENT_SOURCES:
+            for event in self.load_jsonl_iter(filename):
+                if statuses is not None and event.get('status') not in statuses:
+                    continue
+                event['_source'] = source
+                all_events.append(event)
         
         # Sort all events by timestamp
-        all_events.sort(key=lambda x: x['timestamp'])
+        all_events.sort(key=itemgetter('timestamp'))
         
         return all_events
-
@@ -1,14 +1,81 @@
 """
 Event Detection Engine - Main processing pipeline
 """
-import json
+from operator import attrgetter, itemgetter
 from pathlib import Path
-from typing import Dict, List, Any
-from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
 
-from data_loader import DataLoader
-from algorithms import FraudDetectionAlgorithms, OperationalAlgorithms, InventoryAlgorithms
+import orjson
+
+from data_loader import DataLoader, TIMESTAMP_NS_FIELD
+from algorithms import (
+    FraudDetectionAlgorithms, OperationalAlgorithms, InventoryAlgorithms,
+    CRASH_STATUSES, QUEUE_COLUMN_FIELDS
+)
 from config import EVENT_TYPES, THRESHOLDS
+from events import DetectedEvent
+
+# Detection fields that never go into the output event_data
+_INTERNAL_FIELDS = frozenset(('timestamp', 'type', 'risk_score', 'severity', '_source',
+                              TIMESTAMP_NS_FIELD))
+
+# Output event_id/event_name per detection type
+_EVENT_META = {
+    event_type: (meta.get('id', 'E999'), meta.get('name', 'Unknown Event'))
+    for event_type, meta in EVENT_TYPES.items()
+}
+_UNKNOWN_EVENT_META = ('E999', 'Unknown Event')
+
+# DetectedEvent subclass -> generated formatter (filled on first use)
+_FORMATTERS = {}
+
+
+def _build_formatter(event_class: type) -> Callable[[DetectedEvent], Dict[str, Any]]:
+    """Generate format_event_output specialized to one DetectedEvent subclass
+    
+    The class's output fields are known from __slots__, so the generated
+    function reads each one with a direct attribute load and constant key,
+    with no per-field loop or membership test.
+    """
+    lines = [
+        "def format_event(event):",
+        "    event_id, event_name = _EVENT_META.get(event.type, _UNKNOWN_EVENT_META)",
+        "    event_data = {'event_name': event_name}",
+    ]
+    for field in event_class.__slots__:
+        if field in _INTERNAL_FIELDS:
+            continue
+        lines.append(f"    value = event.{field}")
+        lines.append("    if value is not None:")
+        lines.append(f"        event_data[{field!r}] = value")
+    lines.append("    return {'timestamp': event.timestamp, 'event_id': event_id, 'event_data': event_data}")
+    
+    namespace = {'_EVENT_META': _EVENT_META, '_UNKNOWN_EVENT_META': _UNKNOWN_EVENT_META}
+    exec(compile("\n".join(lines), f"<format {event_class.__name__}>", "exec"), namespace)
+    return namespace['format_event']
+
+
+class _DeferredCall:
+    """Future stand-in for serial runs: the call runs on the first result()
+    
+    Each detector then runs after its progress header is printed, as it
+    would without the thread pool.
+    """
+    __slots__ = ('_call', '_value')
+    
+    def __init__(self, func: Callable[..., Any], args: tuple, kwargs: Dict[str, Any]):
+        self._call = (func, args, kwargs)
+        self._value = None
+    
+    def result(self) -> Any:
+        if self._call is not None:
+            func, args, kwargs = self._call
+            self._value = func(*args, **kwargs)
+            self._call = None
+        return self._value
 
 
 class EventDetectionEngine:
@@ -26,6 +93,9 @@ class EventDetectionEngine:
         # Storage for events and data
         self.detected_events = []
         self.products = {}
+        self.catalog_columns = None
+        self.queue_columns = None
+        self.initial_inventory = None
         self.customers = {}
         
     def load_all_data(self):
@@ -34,6 +104,7 @@ class EventDetectionEngine:
         
         # Load reference data
         self.products = self.data_loader.load_products_catalog()
+        self.catalog_columns = DataLoader.build_catalog_columns(self.products)
         self.customers = self.data_loader.load_customer_data()
         
         # Load event streams
@@ -41,134 +112,196 @@ class EventDetectionEngine:
         self.rfid_events = self.data_loader.load_jsonl_file("rfid_readings.jsonl")
         self.recognition_events = self.data_loader.load_jsonl_file("product_recognition.jsonl")
         self.queue_events = self.data_loader.load_jsonl_file("queue_monitoring.jsonl")
-        self.inventory_snapshots = self.data_loader.load_jsonl_file("inventory_snapshots.jsonl")
+        # Only the first snapshot seeds the discrepancy check; don't hold the rest
+        self.initial_inventory = self.data_loader.load_jsonl_first("inventory_snapshots.jsonl")
+        
+        # Numeric queue fields as columns, shared by the three queue detectors
+        self.queue_columns = DataLoader.events_to_columns(self.queue_events, QUEUE_COLUMN_FIELDS)
         
         print(f"✓ Loaded {len(self.pos_events)} POS transactions")
         print(f"✓ Loaded {len(self.rfid_events)} RFID readings")
         print(f"✓ Loaded {len(self.recognition_events)} product recognitions")
         print(f"✓ Loaded {len(self.queue_events)} queue monitoring events")
-        print(f"✓ Loaded {len(self.inventory_snapshots)} inventory snapshots")
+        if self.initial_inventory:
+            print(f"✓ Loaded initial inventory snapshot ({len(self.initial_inventory['data'])} SKUs)")
         print(f"✓ Loaded {len(self.products)} products in catalog")
         print(f"✓ Loaded {len(self.customers)} customer records")
         
-    def process_all_events(self):
-        """Run all detection algorithms"""
+    def process_all_events(self, max_workers: Optional[int] = None):
+        """Run all detection algorithms
+        
+        The detectors only read the loaded streams, so with max_workers > 1 they
+        are submitted to a thread pool together (overlapping the file reads of
+        the system crash pass with the other detectors). Otherwise each detector
+        runs when its progress line is printed. Results are reported and
+        collected in the usual order either way.
+        """
         print("\n" + "="*70)
         print("🔍 RUNNING DETECTION ALGORITHMS")
         print("="*70)
         
-        all_detected = []
-        
-        # Algorithm 1: Scanner Avoidance
-        print("\n[1/9] Detecting Scanner Avoidance...")
-        scanner_avoidance = self.fraud_detector.detect_scanner_avoidance(
-            self.rfid_events,
-            self.pos_events,
-            THRESHOLDS['rfid_pos_time_window'],
-            self.products
-        )
-        all_detected.extend(scanner_avoidance)
-        print(f"   ✓ Found {len(scanner_avoidance)} scanner avoidance events")
-        
-        # Algorithm 2: Barcode Switching
-        print("\n[2/9] Detecting Barcode Switching...")
-        barcode_switching = self.fraud_detector.detect_barcode_switching(
-            self.recognition_events,
-            self.pos_events,
-            THRESHOLDS['product_recognition_confidence'],
-            self.products
-        )
-        all_detected.extend(barcode_switching)
-        print(f"   ✓ Found {len(barcode_switching)} barcode switching events")
-        
-        # Algorithm 3: Weight Discrepancies
-        print("\n[3/9] Detecting Weight Discrepancies...")
-        weight_discrepancies = self.fraud_detector.detect_weight_discrepancies(
-            self.pos_events,
-            self.products,
-            THRESHOLDS['weight_tolerance_percent']
-        )
-        all_detected.extend(weight_discrepancies)
-        print(f"   ✓ Found {len(weight_discrepancies)} weight discrepancy events")
-        
-        # Algorithm 4: Long Queues
-        print("\n[4/9] Detecting Long Queues...")
-        long_queues = self.ops_detector.detect_long_queues(
-            self.queue_events,
-            THRESHOLDS['queue_length_alert']
-        )
-        all_detected.extend(long_queues)
-        print(f"   ✓ Found {len(long_queues)} long queue events")
-        
-        # Algorithm 5: Long Wait Times
-        print("\n[5/9] Detecting Long Wait Times...")
-        long_waits = self.ops_detector.detect_long_wait_times(
-            self.queue_events,
-            THRESHOLDS['wait_time_alert']
-        )
-        all_detected.extend(long_waits)
-        print(f"   ✓ Found {len(long_waits)} long wait time events")
-        
-        # Algorithm 6: System Crashes
-        print("\n[6/9] Detecting System Crashes...")
-        all_events_merged = self.data_loader.merge_all_events()
-        system_crashes = self.ops_detector.detect_system_crashes(all_events_merged)
-        all_detected.extend(system_crashes)
-        print(f"   ✓ Found {len(system_crashes)} system crash events")
-        
-        # Algorithm 7: Staffing Needs
-        print("\n[7/9] Analyzing Staffing Needs...")
-        staffing_needs = self.ops_detector.detect_staffing_needs(
-            self.queue_events,
-            THRESHOLDS['queue_length_alert'],
-            THRESHOLDS['staffing_wait_threshold']
-        )
-        all_detected.extend(staffing_needs)
-        print(f"   ✓ Found {len(staffing_needs)} staffing need events")
-        
-        # Algorithm 8: Inventory Discrepancies
-        if self.inventory_snapshots:
-            print("\n[8/9] Detecting Inventory Discrepancies...")
-            initial_snapshot = self.inventory_snapshots[0]['data']
-            inventory_discrepancies = self.inventory_detector.detect_inventory_discrepancies(
-                initial_snapshot,
-                self.rfid_events,
-                self.pos_events,
-                THRESHOLDS['inventory_discrepancy_threshold']
+        # Thresholds and detectors bound once for the whole detection sequence
+        queue_length_alert = THRESHOLDS['queue_length_alert']
+        rfid_pos_time_window = THRESHOLDS['rfid_pos_time_window']
+        fraud_detector = self.fraud_detector
+        ops_detector = self.ops_detector
+        inventory_detector = self.inventory_detector
+        pos_events = self.pos_events
+        rfid_events = self.rfid_events
+        recognition_events = self.recognition_events
+        queue_events = self.queue_events
+        queue_columns = self.queue_columns
+        
+        executor = ThreadPoolExecutor(max_workers=max_workers) if max_workers and max_workers > 1 else None
+        
+        def submit(func, *args, **kwargs):
+            if executor is not None:
+                return executor.submit(func, *args, **kwargs)
+            return _DeferredCall(func, args, kwargs)
+        
+        try:
+            # Algorithms 1-3: Scanner Avoidance, Barcode Switching, Weight Discrepancies
+            # share one fused pass over the POS, RFID and recognition streams
+            fraud_future = submit(
+                fraud_detector.detect_all_fraud,
+                pos_events,
+                rfid_events,
+                recognition_events,
+                self.products,
+                time_window=rfid_pos_time_window,
+                confidence_threshold=THRESHOLDS['product_recognition_confidence'],
+                tolerance_percent=THRESHOLDS['weight_tolerance_percent'],
+                catalog_columns=self.catalog_columns
             )
-            all_detected.extend(inventory_discrepancies)
-            print(f"   ✓ Found {len(inventory_discrepancies)} inventory discrepancy events")
-        
-        # Algorithm 9: Successful Operations
-        print("\n[9/9] Tracking Successful Operations...")
-        successful = self.inventory_detector.track_successful_operations(
-            self.pos_events,
-            self.rfid_events,
-            self.recognition_events
-        )
-        all_detected.extend(successful)
-        print(f"   ✓ Found {len(successful)} successful operations")
-        
-        self.detected_events = all_detected
-        
-        print("\n" + "="*70)
-        print(f"✅ TOTAL EVENTS DETECTED: {len(all_detected)}")
-        print("="*70)
+            
+            # Algorithm 4: Long Queues
+            long_queues_future = submit(
+                ops_detector.detect_long_queues,
+                queue_events,
+                queue_length_alert,
+                columns=queue_columns
+            )
+            
+            # Algorithm 5: Long Wait Times
+            long_waits_future = submit(
+                ops_detector.detect_long_wait_times,
+                queue_events,
+                THRESHOLDS['wait_time_alert'],
+                columns=queue_columns
+            )
+            
+            # Algorithm 6: System Crashes (streams every file, keeping only failing events)
+            system_crashes_future = submit(
+                lambda: ops_detector.detect_system_crashes(
+                    self.data_loader.merge_all_events(statuses=CRASH_STATUSES))
+            )
+            
+            # Algorithm 7: Staffing Needs
+            staffing_needs_future = submit(
+                ops_detector.detect_staffing_needs,
+                queue_events,
+                queue_length_alert,
+                THRESHOLDS['staffing_wait_threshold'],
+                columns=queue_columns
+            )
+            
+            # Algorithm 8: Inventory Discrepancies
+            inventory_future = None
+            if self.initial_inventory:
+                initial_snapshot = self.initial_inventory['data']
+                inventory_future = submit(
+                    inventory_detector.detect_inventory_discrepancies,
+                    initial_snapshot,
+                    rfid_events,
+                    pos_events,
+                    THRESHOLDS['inventory_discrepancy_threshold']
+                )
+            
+            # Algorithm 9: Successful Operations
+            successful_future = submit(
+                inventory_detector.track_successful_operations,
+                pos_events,
+                rfid_events,
+                recognition_events,
+                time_window=rfid_pos_time_window
+            )
+            
+            # Detector results in reporting order, concatenated once at the end
+            detected_parts = []
+            
+            # Stage headers are flushed so piped or logged runs show which
+            # detector is running, not just block-buffered output at exit
+            print("\n[1-3/9] Detecting Scanner Avoidance, Barcode Switching and Weight Discrepancies...", flush=True)
+            fraud_results = fraud_future.result()
+            scanner_avoidance = fraud_results['SCANNER_AVOIDANCE']
+            barcode_switching = fraud_results['BARCODE_SWITCHING']
+            weight_discrepancies = fraud_results['WEIGHT_DISCREPANCY']
+            detected_parts.extend((scanner_avoidance, barcode_switching, weight_discrepancies))
+            print(f"   ✓ Found {len(scanner_avoidance)} scanner avoidance events")
+            print(f"   ✓ Found {len(barcode_switching)} barcode switching events")
+            print(f"   ✓ Found {len(weight_discrepancies)} weight discrepancy events")
+            
+            print("\n[4/9] Detecting Long Queues...", flush=True)
+            long_queues = long_queues_future.result()
+            detected_parts.append(long_queues)
+            print(f"   ✓ Found {len(long_queues)} long queue events")
+            
+            print("\n[5/9] Detecting Long Wait Times...", flush=True)
+            long_waits = long_waits_future.result()
+            detected_parts.append(long_waits)
+            print(f"   ✓ Found {len(long_waits)} long wait time events")
+            
+            print("\n[6/9] Detecting System Crashes...", flush=True)
+            system_crashes = system_crashes_future.result()
+            detected_parts.append(system_crashes)
+            print(f"   ✓ Found {len(system_crashes)} system crash events")
+            
+            print("\n[7/9] Analyzing Staffing Needs...", flush=True)
+            staffing_needs = staffing_needs_future.result()
+            detected_parts.append(staffing_needs)
+            print(f"   ✓ Found {len(staffing_needs)} staffing need events")
+            
+            if inventory_future is not None:
+                print("\n[8/9] Detecting Inventory Discrepancies...", flush=True)
+                inventory_discrepancies = inventory_future.result()
+                detected_parts.append(inventory_discrepancies)
+                print(f"   ✓ Found {len(inventory_discrepancies)} inventory discrepancy events")
+            
+            print("\n[9/9] Tracking Successful Operations...", flush=True)
+            successful = successful_future.result()
+            detected_parts.append(successful)
+            print(f"   ✓ Found {len(successful)} successful operations")
+            
+            all_detected = list(chain.from_iterable(detected_parts))
+            self.detected_events = all_detected
+            
+            print("\n" + "="*70)
+            print(f"✅ TOTAL EVENTS DETECTED: {len(all_detected)}")
+            print("="*70)
+        finally:
+            if executor is not None:
+                executor.shutdown()
         
         return all_detected
     
     def format_event_output(self, event: Dict[str, Any]) -> Dict[str, Any]:
         """Format detected event into required output schema"""
-        event_type = event['type']
-        event_id = EVENT_TYPES.get(event_type, {}).get('id', 'E999')
-        event_name = EVENT_TYPES.get(event_type, {}).get('name', 'Unknown Event')
+        # Slotted events go through a formatter generated for their class
+        if isinstance(event, DetectedEvent):
+            event_class = type(event)
+            formatter = _FORMATTERS.get(event_class)
+            if formatter is None:
+                formatter = _FORMATTERS[event_class] = _build_formatter(event_class)
+            return formatter(event)
+        
+        event_id, event_name = _EVENT_META.get(event['type'], _UNKNOWN_EVENT_META)
         
         # Build event_data based on type
         event_data = {'event_name': event_name}
         
         # Copy relevant fields
         for key, value in event.items():
-            if key not in ['timestamp', 'type', 'risk_score', 'severity', '_source']:
+            if key not in _INTERNAL_FIELDS:
                 if value is not None:
                     event_data[key] = value
         
@@ -186,46 +319,55 @@ class EventDetectionEngine:
         output_file = Path(output_path)
         output_file.parent.mkdir(parents=True, exist_ok=True)
         
-        # Sort events by timestamp
-        sorted_events = sorted(self.detected_events, key=lambda x: x['timestamp'])
-        
-        with open(output_file, 'w', encoding='utf-8') as f:
-            for event in sorted_events:
-                formatted_event = self.format_event_output(event)
-                f.write(json.dumps(formatted_event, separators=(',', ':')) + '\n')
+        # Sort events by timestamp (slotted events via a C-level attribute read
+        # rather than the Python __getitem__ of the mapping interface)
+        events = self.detected_events
+        if all(isinstance(event, DetectedEvent) for event in events):
+            timestamp_key = attrgetter('timestamp')
+        else:
+            timestamp_key = itemgetter('timestamp')
+        sorted_events = sorted(events, key=timestamp_key)
+        
+        # Format and serialize each event straight into the file buffer, so no
+        # output dicts or encoded lines are kept around
+        format_event_output = self.format_event_output
+        dumps = orjson.dumps
+        lines = (dumps(format_event_output(event), option=orjson.OPT_APPEND_NEWLINE)
+                 for event in sorted_events)
+        with open(output_file, 'wb') as f:
+            f.writelines(lines)
         
         print(f"\n✅ Saved {len(sorted_events)} events to {output_path}")
         
     def generate_summary(self) -> Dict[str, Any]:
         """Generate summary statistics"""
-        event_counts = defaultdict(int)
-        severity_counts = defaultdict(int)
-        station_load = defaultdict(int)
-        total_risk = 0
-        risk_count = 0
-        
-        for event in self.detected_events:
-            event_type = event['type']
-            event_counts[event_type] += 1
-            
-            severity = event.get('severity', 'UNKNOWN')
-            severity_counts[severity] += 1
-            
-            station_id = event.get('station_id')
-            if station_id:
-                station_load[station_id] += 1
-            
-            if 'risk_score' in event:
-                total_risk += event['risk_score']
-                risk_count += 1
+        events = self.detected_events
+        
+        # Histograms counted in C by Counter over one field per pass; every
+        # slotted event class has type and severity, read via attrgetter
+        if all(isinstance(event, DetectedEvent) for event in events):
+            event_counts = Counter(map(attrgetter('type'), events))
+            severity_counts = Counter(map(attrgetter('severity'), events))
+        else:
+            event_counts = Counter([event['type'] for event in events])
+            severity_counts = Counter([event.get('severity', 'UNKNOWN') for event in events])
+        station_load = Counter([event.get('station_id') for event in events])
+        # Events without a station don't count towards load (Counter ignores
+        # deleting absent keys)
+        del station_load[None]
+        del station_load['']
+        
+        risk_scores = [event['risk_score'] for event in events if 'risk_score' in event]
+        total_risk = sum(risk_scores)
+        risk_count = len(risk_scores)
         
         avg_risk = round(total_risk / risk_count, 2) if risk_count > 0 else 0
         
         # Top stations by event count
-        top_stations = sorted(station_load.items(), key=lambda x: x[1], reverse=True)[:5]
+        top_stations = station_load.most_common(5)
         
         summary = {
-            'total_events': len(self.detected_events),
+            'total_events': len(events),
             'event_breakdown': dict(event_counts),
             'severity_breakdown': dict(severity_counts),
             'average_risk_score': avg_risk,
@@ -0,0 +1,133 @@
+"""
+Detected Event Records for Sentinel Fraud Detection System
+Fixed-schema, slotted records emitted by the detection algorithms
+"""
+from typing import Any, Callable, Dict, Iterator, Tuple
+
+
+class DetectedEvent:
+    """Base record for detected events
+
+    Each event type declares its fields in ``__slots__`` (in output order), so
+    instances carry no per-object ``__dict__``. Every subclass gets a generated
+    ``__init__`` taking exactly those fields, positionally or by keyword.
+    Read-only mapping access (``event['type']``, ``event.get(...)``, ``in``,
+    ``items()``) is kept for code written against the original dict events.
+    Like those dicts, events are unhashable and compare by value: an event
+    equals a plain dict holding the same fields.
+    """
+    __slots__ = ()
+
+    # Field names as a set, for O(1) key checks (set per subclass)
+    _field_set = frozenset()
+
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        cls._field_set = frozenset(cls.__slots__)
+        cls.__init__ = _build_init(cls)
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._field_set:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._field_set
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__slots__)
+
+    def __len__(self) -> int:
+        return len(self.__slots__)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, DetectedEvent):
+            other = other.to_dict()
+        return self.to_dict() == other
+
+    def __repr__(self) -> str:
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self._field_set:
+            return getattr(self, key)
+        return default
+
+    def keys(self) -> Tuple[str, ...]:
+        return self.__slots__
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        for name in self.__slots__:
+            yield name, getattr(self, name)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a plain dict (legacy JSON path)"""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def _build_init(event_class: type) -> Callable[..., None]:
+    """Generate an __init__ assigning each of the class's slots from its own parameter
+
+    A fixed signature lets the interpreter bind the fields directly, with no
+    kwargs dict or per-field setattr loop.
+    """
+    fields = event_class.__slots__
+    lines = [f"def __init__(self, {', '.join(fields)}):"]
+    lines.extend(f"    self.{field} = {field}" for field in fields)
+
+    namespace = {}
+    exec(compile("\n".join(lines), f"<init {event_class.__name__}>", "exec"), namespace)
+    init = namespace['__init__']
+    init.__qualname__ = f"{event_class.__qualname__}.__init__"
+    return init
+
+
+class ScannerAvoidanceEvent(DetectedEvent):
+    __slots__ = ('timestamp', 'type', 'station_id', 'product_sku', 'estimated_loss',
+                 'risk_score', 'severity')
+
+
+class BarcodeSwitchingEvent(DetectedEvent):
+    __slots__ = ('timestamp', 'type', 'station_id', 'customer_id', 'actual_sku', 'scanned_sku',
+                 'confidence', 'price_gap', 'predicted_price', 'scanned_price',
+                 'risk_score', 'severity')
+
+
+class WeightDiscrepancyEvent(DetectedEvent):
+    __slots__ = ('timestamp', 'type', 'station_id', 'customer_id', 'product_sku',
+                 'expected_weight', 'actual_weight', 'difference_percent', 'estimated_loss',
+                 'risk_score', 'severity')
+
+
+class LongQueueEvent(DetectedEvent):
+    __slots__ = ('timestamp', 'type', 'station_id', 'num_of_customers', 'risk_score', 'severity')
+
+
+class LongWaitEvent(DetectedEvent):
+    __slots__ = ('timestamp', 'type', 'station_id', 'wait_time_seconds', 'customer_count',
+                 'risk_score', 'severity')
+
+
+class SystemCrashEvent(DetectedEvent):
+    __slots__ = ('timestamp', 'type', 'station_id', 'duration_seconds', 'crash_count',
+                 'system_source', 'risk_score', 'severity')
+
+
+class StaffingNeedsEvent(DetectedEvent):
+    __slots__ = ('timestamp', 'type', 'station_id', 'Staff_type', 'reason', 'risk_score', 'severity')
+
+
+class CheckoutActionEvent(DetectedEvent):
+    __slots__ = ('timestamp', 'type', 'Action', 'reason', 'current_stations', 'total_customers',
+                 'risk_score', 'severity')
+
+
+class InventoryDiscrepancyEvent(DetectedEvent):
+    __slots__ = ('timestamp', 'type', 'SKU', 'Expected_Inventory', 'Actual_Inventory',
+                 'Difference', 'Difference_Percent', 'risk_score', 'severity')
+
+
+class SuccessEvent(DetectedEvent):
+    __slots__ = ('timestamp', 'type', 'station_id', 'customer_id', 'product_sku',
+                 'service_score', 'risk_score', 'severity')
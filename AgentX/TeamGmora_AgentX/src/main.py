@@ -4,9 +4,10 @@ Main entry point for processing and analysis
 """
 import sys
 import argparse
-import json
 from pathlib import Path
 
+import orjson
+
 from event_engine import EventDetectionEngine
 from dashboard import start_dashboard
 
@@ -46,6 +47,8 @@ Examples:
                        help='Events file for dashboard-only mode')
     parser.add_argument('--port', type=int, default=5000,
                        help='Dashboard port (default: 5000)')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Threads for running detectors concurrently (default: 1)')
     
     args = parser.parse_args()
     
@@ -92,7 +95,7 @@ Examples:
         
         # Process and detect events
         print("\n🔍 Running detection algorithms...")
-        detected_events = engine.process_all_events()
+        detected_events = engine.process_all_events(max_workers=args.workers)
         
         # Validate output directory
         output_path = Path(args.output)
@@ -127,8 +130,7 @@ Examples:
             
             # Save summary to JSON
             summary_path = output_path.parent / "summary.json"
-            with open(summary_path, 'w', encoding='utf-8') as f:
-                json.dump(summary, f, indent=2)
+            summary_path.write_bytes(orjson.dumps(summary, option=orjson.OPT_INDENT_2))
             print(f"\n✅ Summary saved to {summary_path}")
         
         print("\n" + "="*70)
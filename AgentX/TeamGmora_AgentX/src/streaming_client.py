@@ -2,12 +2,25 @@
 Real-time streaming client for Project Sentinel
 Connects to the streaming server and processes events in real-time
 """
+import asyncio
+import inspect
 import socket
-import json
 from typing import Callable, Optional
 from threading import Thread
 import time
 
+import orjson
+
+# Read buffer for the socket file; lines are framed in C by the buffered reader
+_READ_BUFFER_SIZE = 65536
+
+# Kernel receive buffer requested for the stream socket (Linux caps it at
+# net.core.rmem_max); set before connecting so the TCP window can scale to it
+_SOCKET_RCVBUF = 4 << 20
+
+# Longest line the asyncio reader accepts (inventory snapshots carry every SKU)
+_ASYNC_LINE_LIMIT = 1 << 20
+
 
 class StreamingClient:
     """Client for connecting to the event stream server"""
@@ -16,18 +29,30 @@ class StreamingClient:
         self.host = host
         self.port = port
         self.socket = None
+        self._rfile = None
+        self._reader = None
+        self._writer = None
         self.running = False
         self.event_handlers = []
         
+    @staticmethod
+    def _new_socket() -> socket.socket:
+        """Create the stream socket with an enlarged receive buffer"""
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, _SOCKET_RCVBUF)
+        return sock
+        
     def connect(self):
         """Connect to the streaming server"""
-        self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.socket = self._new_socket()
         self.socket.connect((self.host, self.port))
+        self._rfile = self.socket.makefile('rb', buffering=_READ_BUFFER_SIZE)
         print(f"Connected to stream server at {self.host}:{self.port}")
         
-        # Read banner
-        banner_line = self.socket.recv(4096).decode('utf-8')
-        banner = json.loads(banner_line)
+        # Read banner (first line; later lines stay buffered for streaming)
+        self._print_banner(orjson.loads(self._rfile.readline()))
+        
+    def _print_banner(self, banner: dict):
         print(f"\nStream Info:")
         print(f"  Service: {banner.get('service')}")
         print(f"  Datasets: {', '.join(banner.get('datasets', []))}")
@@ -37,43 +62,42 @@ class StreamingClient:
         print()
         
     def add_event_handler(self, handler: Callable):
-        """Add a callback function to handle incoming events"""
+        """Add a callback function to handle incoming events
+        
+        Coroutine functions are also accepted by the asyncio client, which runs
+        them as tasks so a slow handler doesn't stall the read loop.
+        """
         self.event_handlers.append(handler)
         
     def start_streaming(self, limit: Optional[int] = None):
         """Start receiving events from the stream"""
         self.running = True
         event_count = 0
-        buffer = ""
         
         try:
-            while self.running:
-                # Receive data
-                chunk = self.socket.recv(4096).decode('utf-8')
-                if not chunk:
+            # Iterate complete lines straight from the buffered socket file
+            for line in self._rfile:
+                if not self.running:
                     break
+                if not line.strip():
+                    continue
                 
-                buffer += chunk
+                try:
+                    event = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    print(f"Failed to parse event: {line[:100].decode('utf-8', 'replace')}")
+                    continue
                 
-                # Process complete lines
-                while '\n' in buffer:
-                    line, buffer = buffer.split('\n', 1)
-                    if line.strip():
-                        try:
-                            event = json.loads(line)
-                            event_count += 1
-                            
-                            # Call all registered handlers
-                            for handler in self.event_handlers:
-                                handler(event)
-                            
-                            # Check limit
-                            if limit and event_count >= limit:
-                                self.running = False
-                                break
-                                
-                        except json.JSONDecodeError:
-                            print(f"Failed to parse event: {line[:100]}")
+                event_count += 1
+                
+                # Call all registered handlers
+                for handler in self.event_handlers:
+                    handler(event)
+                
+                # Check limit
+                if limit and event_count >= limit:
+                    self.running = False
+                    break
                             
         except KeyboardInterrupt:
             print("\nStopped by user")
@@ -83,15 +107,120 @@ class StreamingClient:
         print(f"\nProcessed {event_count} events")
         
     def close(self):
-        """Close the connection"""
+        """Close the connection (safe to call from another thread while streaming)"""
+        self.running = False
+        sock, rfile = self.socket, self._rfile
+        self.socket = self._rfile = None
+        if sock:
+            # Wake a reader blocked in another thread (it sees EOF) before the
+            # socket file is closed
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        if rfile:
+            rfile.close()
+        if sock:
+            sock.close()
+            print("Connection closed")
+    
+    async def connect_async(self):
+        """Connect to the streaming server from an asyncio event loop"""
+        sock = self._new_socket()
+        sock.setblocking(False)
+        try:
+            await asyncio.get_running_loop().sock_connect(sock, (self.host, self.port))
+        except BaseException:
+            sock.close()
+            raise
+        self._reader, self._writer = await asyncio.open_connection(
+            sock=sock, limit=_ASYNC_LINE_LIMIT)
+        print(f"Connected to stream server at {self.host}:{self.port}")
+        
+        self._print_banner(orjson.loads(await self._reader.readline()))
+        
+    async def start_streaming_async(self, limit: Optional[int] = None,
+                                    read_timeout: Optional[float] = None):
+        """Receive events on the event loop (see start_streaming)
+        
+        read_timeout, when given, ends the stream if no line arrives in time.
+        """
+        self.running = True
+        event_count = 0
+        pending = set()
+        reader = self._reader
+        
+        try:
+            while self.running:
+                try:
+                    line = await asyncio.wait_for(reader.readline(), timeout=read_timeout)
+                except asyncio.TimeoutError:
+                    print(f"\nNo events for {read_timeout}s, stopping")
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                
+                try:
+                    event = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    print(f"Failed to parse event: {line[:100].decode('utf-8', 'replace')}")
+                    continue
+                
+                event_count += 1
+                
+                # Plain handlers run inline; coroutine handlers become tasks
+                for handler in self.event_handlers:
+                    result = handler(event)
+                    if inspect.isawaitable(result):
+                        task = asyncio.ensure_future(result)
+                        pending.add(task)
+                        task.add_done_callback(pending.discard)
+                
+                # Check limit
+                if limit and event_count >= limit:
+                    self.running = False
+                    break
+            
+            if pending:
+                await asyncio.gather(*pending)
+        finally:
+            await self.close_async()
+            
+        print(f"\nProcessed {event_count} events")
+        
+    async def close_async(self):
+        """Close the asyncio connection"""
         self.running = False
-        if self.socket:
-            self.socket.close()
+        if self._writer:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except ConnectionError:
+                pass
+            self._writer = None
+            self._reader = None
             print("Connection closed")
+        
+    def run(self, limit: Optional[int] = None, read_timeout: Optional[float] = None):
+        """Connect and stream on a fresh asyncio event loop (blocking)"""
+        async def main():
+            await self.connect_async()
+            await self.start_streaming_async(limit, read_timeout)
+        
+        try:
+            asyncio.run(main())
+        except KeyboardInterrupt:
+            print("\nStopped by user")
 
 
 class EventBuffer:
-    """Buffer for accumulating events by type"""
+    """Buffer for accumulating events by type
+    
+    Each buffer is a plain list of payload dicts, and get_all_buffers returns
+    the live lists: callers index, slice and mutate them in place.
+    """
     
     def __init__(self):
         self.pos_events = []
@@ -1,8 +1,11 @@
 """
 Test suite for Project Sentinel algorithms
 """
+import io
+import sys
 import unittest
-from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
 from algorithms import FraudDetectionAlgorithms, OperationalAlgorithms, InventoryAlgorithms
 from config import THRESHOLDS
 
@@ -10,8 +13,10 @@ from config import THRESHOLDS
 class TestFraudDetection(unittest.TestCase):
     """Test fraud detection algorithms"""
     
-    def setUp(self):
-        self.detector = FraudDetectionAlgorithms({'THRESHOLDS': THRESHOLDS})
+    @classmethod
+    def setUpClass(cls):
+        # Detectors only read their thresholds, so one instance serves every test
+        cls.detector = FraudDetectionAlgorithms({'THRESHOLDS': THRESHOLDS})
         
     def test_scanner_avoidance_detection(self):
         """Test scanner avoidance detection"""
@@ -101,8 +106,9 @@ class TestFraudDetection(unittest.TestCase):
 class TestOperationalAlgorithms(unittest.TestCase):
     """Test operational monitoring algorithms"""
     
-    def setUp(self):
-        self.detector = OperationalAlgorithms({'THRESHOLDS': THRESHOLDS})
+    @classmethod
+    def setUpClass(cls):
+        cls.detector = OperationalAlgorithms({'THRESHOLDS': THRESHOLDS})
         
     def test_long_queue_detection(self):
         """Test long queue detection"""
@@ -160,5 +166,106 @@ class TestOperationalAlgorithms(unittest.TestCase):
         self.assertIn('risk_score', results[0])
 
 
+class TestInventoryAlgorithms(unittest.TestCase):
+    """Test inventory and multi-source validation algorithms"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.detector = InventoryAlgorithms({'THRESHOLDS': THRESHOLDS})
+
+    def _track_with_offset(self, seconds, time_window=10):
+        """Run windowed success matching with readings `seconds` after the POS line"""
+        reading_time = (datetime(2025, 8, 13, 16, 0, 0) + timedelta(seconds=seconds)).isoformat()
+        pos_events = [
+            {
+                'timestamp': '2025-08-13T16:00:00',
+                'station_id': 'SCC1',
+                'data': {'sku': 'PRD_F_01', 'customer_id': 'C001'}
+            }
+        ]
+        rfid_events = [
+            {
+                'timestamp': reading_time,
+                'station_id': 'SCC1',
+                'data': {'sku': 'PRD_F_01', 'location': 'IN_SCAN_AREA'}
+            }
+        ]
+        recognition = [
+            {
+                'timestamp': reading_time,
+                'station_id': 'SCC1',
+                'data': {'predicted_product': 'PRD_F_01', 'accuracy': 0.95}
+            }
+        ]
+        return self.detector.track_successful_operations(
+            pos_events, rfid_events, recognition, time_window=time_window)
+
+    def test_successful_operation_inside_window(self):
+        """Readings within the window either side of the POS line match"""
+        for seconds in (0, 3, -3):
+            results = self._track_with_offset(seconds)
+            self.assertEqual(len(results), 1)
+            self.assertEqual(results[0]['type'], 'SUCCESS')
+            self.assertEqual(results[0]['timestamp'], '2025-08-13T16:00:00')
+
+    def test_successful_operation_window_boundary(self):
+        """Readings exactly time_window seconds away still match"""
+        self.assertEqual(len(self._track_with_offset(10)), 1)
+        self.assertEqual(len(self._track_with_offset(-10)), 1)
+
+    def test_successful_operation_outside_window(self):
+        """Readings past the window do not match"""
+        self.assertEqual(self._track_with_offset(11), [])
+        self.assertEqual(self._track_with_offset(-11), [])
+
+    def test_successful_operation_skips_unparseable_time(self):
+        """Events with a malformed timestamp are skipped, not raised on"""
+        pos_events = [
+            {
+                'timestamp': '2025-08-13 16:00:xx',
+                'station_id': 'SCC1',
+                'data': {'sku': 'PRD_F_01', 'customer_id': 'C001'}
+            }
+        ]
+        rfid_events = [
+            {
+                'timestamp': '2025-08-13 16:00:xx',
+                'station_id': 'SCC1',
+                'data': {'sku': 'PRD_F_01', 'location': 'IN_SCAN_AREA'}
+            }
+        ]
+
+        results = self.detector.track_successful_operations(
+            pos_events, rfid_events, [], time_window=10)
+        self.assertEqual(results, [])
+
+
+def _run_test_case(name):
+    """Run one TestCase class of this module; return (report, successful)"""
+    stream = io.StringIO()
+    suite = unittest.defaultTestLoader.loadTestsFromTestCase(globals()[name])
+    result = unittest.TextTestRunner(stream=stream).run(suite)
+    return stream.getvalue(), result.wasSuccessful()
+
+
+def run_parallel():
+    """Run the TestCase classes in separate worker processes
+
+    The classes share no fixtures, so each gets its own process; reports are
+    printed in definition order once all of them finish.
+    """
+    names = [name for name, value in globals().items()
+             if isinstance(value, type) and issubclass(value, unittest.TestCase)]
+    with ProcessPoolExecutor(max_workers=len(names)) as executor:
+        results = list(executor.map(_run_test_case, names))
+    
+    for report, _ in results:
+        sys.stderr.write(report)
+    return all(successful for _, successful in results)
+
+
 if __name__ == '__main__':
-    unittest.main()
+    # Options or test names go to the regular serial runner
+    if len(sys.argv) > 1:
+        unittest.main()
+    sys.exit(0 if run_parallel() else 1)
@@ -0,0 +1,106 @@
+"""
+Test suite for the dashboard's incremental events file reload
+"""
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+import orjson
+
+import dashboard
+
+
+def _event(i):
+    """One events.jsonl line, cycling through stations and event types"""
+    event_id = ('E001', 'E004', 'E007', 'E000')[i % 4]
+    return orjson.dumps({
+        'timestamp': f'2025-08-13T{10 + i % 8:02d}:00:{i % 60:02d}',
+        'event_id': event_id,
+        'event_data': {
+            'event_name': f'Event {event_id}',
+            'station_id': f'SCC{i % 3}',
+            'customer_id': f'C{i % 5:03d}'
+        }
+    }, option=orjson.OPT_APPEND_NEWLINE)
+
+
+def _lines(start, stop):
+    return b''.join(_event(i) for i in range(start, stop))
+
+
+class TestIncrementalReload(unittest.TestCase):
+    """Tail reloads must end with the same metrics as a full reload"""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'events.jsonl')
+
+        # Start every test from a dashboard that has never loaded a file
+        dashboard.METRICS_STATE = None
+        dashboard.LAST_MODIFIED_TIME = None
+        dashboard.EVENTS_OFFSET = 0
+        dashboard.EVENTS_TAIL = b''
+        dashboard.EVENTS_INODE = None
+
+    def _write(self, data, mode='wb'):
+        with open(self.path, mode) as f:
+            f.write(data)
+
+    def _load(self, force_reload=False):
+        """Reload the file; return the published metrics and events"""
+        with contextlib.redirect_stdout(io.StringIO()):
+            dashboard.load_events_from_file(self.path, force_reload=force_reload)
+        state = dashboard.DASHBOARD_STATE
+        return state['metrics'], list(state['events'])
+
+    def assertMatchesFullReload(self, result, expected_events):
+        metrics, events = result
+        self.assertEqual(len(events), expected_events)
+        self.assertEqual((metrics, events), self._load(force_reload=True))
+
+    def test_appended_file(self):
+        """Appended lines are folded into the existing metrics"""
+        self._write(_lines(0, 40))
+        self._load()
+        accumulator = dashboard.METRICS_STATE
+
+        self._write(_lines(40, 65), 'ab')
+        result = self._load()
+        self.assertIs(dashboard.METRICS_STATE, accumulator)
+        self.assertMatchesFullReload(result, 65)
+
+    def test_truncated_file(self):
+        """A file rewritten shorter is reloaded from scratch"""
+        self._write(_lines(0, 40))
+        self._load()
+        accumulator = dashboard.METRICS_STATE
+
+        self._write(_lines(100, 110))
+        result = self._load()
+        self.assertIsNot(dashboard.METRICS_STATE, accumulator)
+        self.assertMatchesFullReload(result, 10)
+
+    def test_partial_line(self):
+        """A last line still being written is only loaded once complete"""
+        line = _event(40)
+        self._write(_lines(0, 40) + line[:20])
+        self.assertMatchesFullReload(self._load(), 40)
+
+        # The writer finishes the line and appends more
+        self._write(line[20:] + _lines(41, 50), 'ab')
+        self.assertMatchesFullReload(self._load(), 50)
+
+    def test_unterminated_complete_line(self):
+        """A complete last event without a trailing newline is loaded"""
+        self._write(_lines(0, 10) + _event(10).rstrip(b'\n'))
+        self.assertMatchesFullReload(self._load(), 11)
+
+        self._write(b'\n' + _lines(11, 15), 'ab')
+        self.assertMatchesFullReload(self._load(), 15)
+
+
+if __name__ == '__main__':
+    unittest.main()